@@ -0,0 +1,144 @@
+"""
+Audio encoding utilities for KittenTTS Server
+Encodes generated float audio into the containers the API advertises.
+"""
+
+import io
+import logging
+import struct
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+# Opus (in an Ogg container) only supports these input rates
+_OPUS_SAMPLE_RATE = 48000
+
+
+def _to_pcm16(audio: np.ndarray) -> np.ndarray:
+    """Convert float audio in [-1, 1] to 16-bit PCM samples.
+
+    Scale-with-cast and in-place clip keep this at two passes over the
+    data (one temporary) instead of the four separate convert/clip/scale/
+    cast passes a naive expression would make.
+    """
+    scaled = np.multiply(audio, 32767.0, dtype=np.float32)
+    np.clip(scaled, -32767.0, 32767.0, out=scaled)
+    return scaled.astype(np.int16)
+
+
+def _resample(audio: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """Resample audio, preferring soxr with a linear-interpolation fallback"""
+    if orig_rate == target_rate:
+        return np.asarray(audio, dtype=np.float32)
+
+    try:
+        import soxr
+        return soxr.resample(np.asarray(audio, dtype=np.float32), orig_rate, target_rate)
+    except ImportError:
+        target_len = int(round(len(audio) * target_rate / orig_rate))
+        positions = np.linspace(0, len(audio) - 1, target_len)
+        return np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+
+def _encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+    # A mono PCM16 WAV is a fixed 44-byte header plus the samples, so pack
+    # it directly instead of going through libsndfile's format negotiation
+    pcm = _to_pcm16(audio).astype('<i2', copy=False)
+    n = pcm.nbytes
+    header = struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + n, b'WAVE',
+        b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b'data', n,
+    )
+    return header + pcm.tobytes()
+
+
+def _encode_flac(audio: np.ndarray, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, _to_pcm16(audio), sample_rate, format='FLAC')
+    return buffer.getvalue()
+
+
+def _encode_opus(audio: np.ndarray, sample_rate: int) -> bytes:
+    # libsndfile's Opus support requires a 48 kHz stream
+    audio = _resample(audio, sample_rate, _OPUS_SAMPLE_RATE)
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, _OPUS_SAMPLE_RATE, format='OGG', subtype='OPUS')
+    return buffer.getvalue()
+
+
+def _encode_mp3(audio: np.ndarray, sample_rate: int) -> bytes:
+    import lameenc
+
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(64)
+    encoder.set_in_sample_rate(sample_rate)
+    encoder.set_channels(1)
+    encoder.set_quality(5)
+
+    pcm = _to_pcm16(audio).tobytes()
+    return bytes(encoder.encode(pcm)) + bytes(encoder.flush())
+
+
+def _encode_aac(audio: np.ndarray, sample_rate: int) -> bytes:
+    import av
+
+    buffer = io.BytesIO()
+    with av.open(buffer, 'w', format='adts') as container:
+        stream = container.add_stream('aac', rate=sample_rate)
+
+        frame = av.AudioFrame.from_ndarray(
+            _to_pcm16(audio).reshape(1, -1), format='s16', layout='mono'
+        )
+        frame.sample_rate = sample_rate
+
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):  # Flush the encoder
+            container.mux(packet)
+
+    return buffer.getvalue()
+
+
+def _encode_pcm(audio: np.ndarray, sample_rate: int) -> bytes:
+    # Raw little-endian 16-bit PCM, no container
+    return _to_pcm16(audio).tobytes()
+
+
+# Encoder table keyed by response format; mp3/aac need optional packages
+# (lameenc / av) and fall back to WAV when those are missing
+AUDIO_ENCODERS = {
+    "wav": _encode_wav,
+    "mp3": _encode_mp3,
+    "opus": _encode_opus,
+    "aac": _encode_aac,
+    "flac": _encode_flac,
+    "pcm": _encode_pcm,
+}
+
+
+def encode_audio(audio: np.ndarray, sample_rate: int, format_ext: str) -> tuple:
+    """Encode audio into the requested format.
+
+    Args:
+        audio: Float audio samples in [-1, 1]
+        sample_rate: Sample rate of the audio
+        format_ext: Requested format ("wav", "mp3", "opus", "aac", "flac", "pcm")
+
+    Returns:
+        Tuple of (encoded_bytes, actual_format) — actual_format is "wav" when
+        the requested encoder's optional dependency is unavailable
+    """
+    encoder = AUDIO_ENCODERS.get(format_ext, _encode_wav)
+
+    try:
+        return encoder(audio, sample_rate), format_ext
+    except ImportError as e:
+        logger.warning(f"No encoder available for '{format_ext}' ({e}), falling back to WAV")
+    except Exception as e:
+        logger.warning(f"Encoding to '{format_ext}' failed ({e}), falling back to WAV")
+
+    return _encode_wav(audio, sample_rate), "wav"
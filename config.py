@@ -2,52 +2,127 @@
 Configuration settings for KittenTTS Server
 """
 
+import json
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple
+
+
+def _env_flag(name: str, default: str) -> bool:
+    """Parse a boolean environment variable"""
+    return os.getenv(name, default).lower() in ("true", "1", "yes", "on")
+
+
+def _env_providers(name: str) -> Tuple:
+    """Parse an execution provider list from a JSON environment variable.
+
+    Accepts entries that are provider names or [name, options] pairs, e.g.
+    '[["TensorrtExecutionProvider", {"trt_fp16_enable": true}], "CPUExecutionProvider"]'.
+    Returns an empty tuple (auto-detect) when unset or unparseable.
+    """
+    raw = os.getenv(name, "")
+    if not raw:
+        return ()
+    try:
+        entries = json.loads(raw)
+        return tuple(
+            (entry[0], entry[1]) if isinstance(entry, list) else entry
+            for entry in entries
+        )
+    except (ValueError, IndexError, TypeError):
+        return ()
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Immutable server settings, read from the environment exactly once"""
 
-class Config:
-    """Server configuration class"""
-    
     # Server settings
-    HOST = os.getenv("KITTENTTS_HOST", "0.0.0.0")
-    PORT = int(os.getenv("KITTENTTS_PORT", 8001))
-    LOG_LEVEL = os.getenv("KITTENTTS_LOG_LEVEL", "INFO")
-    
+    HOST: str
+    PORT: int
+    LOG_LEVEL: str
+    WORKERS: int
+
     # Text processing limits
-    MAX_TEXT_LENGTH = int(os.getenv("KITTENTTS_MAX_TEXT_LENGTH", 4000))  # Legacy limit for backward compatibility
-    MAX_TOTAL_CHARS = int(os.getenv("KITTENTTS_MAX_TOTAL_CHARS", 50000))  # Absolute maximum to prevent abuse
-    MAX_CHARS_PER_CHUNK = int(os.getenv("KITTENTTS_MAX_CHARS_PER_CHUNK", 1200))  # Optimal chunk size for TTS
-    ENABLE_CHUNKING = os.getenv("KITTENTTS_ENABLE_CHUNKING", "true").lower() in ("true", "1", "yes", "on")
-    
+    MAX_TEXT_LENGTH: int
+    MAX_TOTAL_CHARS: int
+    MAX_CHARS_PER_CHUNK: int
+    ENABLE_CHUNKING: bool
+
     # GPU acceleration settings
-    USE_GPU = os.getenv("KITTENTTS_USE_GPU", "true").lower() in ("true", "1", "yes", "on")
-    GPU_PROVIDER = os.getenv("KITTENTTS_GPU_PROVIDER", "auto")  # auto, coreml, cuda, cpu
-    ONNX_THREADS = int(os.getenv("KITTENTTS_ONNX_THREADS", 0))  # 0 = auto
-    
+    USE_GPU: bool
+    GPU_PROVIDER: str
+    # Dynamic INT8 weight quantization for CPU-only deployments
+    INT8_CPU: bool
+    ONNX_THREADS: int
+    # Per-worker intra-op budget so N workers don't oversubscribe the cores
+    ONNX_INTRA_OP_THREADS: int
+    # Explicit execution provider list (entries are names or
+    # [name, options] pairs); empty means auto-detect
+    ONNX_PROVIDERS: Tuple
+
+    # Worker threads for blocking TTS inference / audio encoding
+    TTS_WORKERS: int
+
+    # Response caching
+    RESPONSE_CACHE_SIZE: int
+    DISK_CACHE_DIR: str
+
     # Voice mapping from OpenAI names to KittenTTS voices
-    VOICE_MAPPING = {
-        "alloy": "expr-voice-5-m",      # Male voice
-        "echo": "expr-voice-2-m",       # Male voice  
-        "fable": "expr-voice-3-f",      # Female voice
-        "onyx": "expr-voice-4-m",       # Male voice
-        "nova": "expr-voice-5-f",       # Female voice
-        "shimmer": "expr-voice-2-f"     # Female voice
-    }
-    
+    VOICE_MAPPING: Dict[str, str]
+
     # Default audio settings
-    DEFAULT_SAMPLE_RATE = 44100
-    DEFAULT_SPEED = 1.0
-    MIN_SPEED = 0.25
-    MAX_SPEED = 4.0
-    
-    # Supported audio formats
-    SUPPORTED_FORMATS = ["wav", "mp3", "opus", "aac", "flac", "pcm"]
-    
-    @classmethod
-    def get_kitten_voice(cls, openai_voice: str) -> str:
+    DEFAULT_SAMPLE_RATE: int = 44100
+    DEFAULT_SPEED: float = 1.0
+    MIN_SPEED: float = 0.25
+    MAX_SPEED: float = 4.0
+
+    # Supported audio formats (frozenset: membership checks are the only use)
+    SUPPORTED_FORMATS: FrozenSet[str] = frozenset(("wav", "mp3", "opus", "aac", "flac", "pcm"))
+
+    def get_kitten_voice(self, openai_voice: str) -> str:
         """Get KittenTTS voice name from OpenAI voice name"""
-        return cls.VOICE_MAPPING.get(openai_voice, "expr-voice-5-m")
-    
-    @classmethod
-    def clamp_speed(cls, speed: float) -> float:
+        return self.VOICE_MAPPING.get(openai_voice, "expr-voice-5-m")
+
+    def clamp_speed(self, speed: float) -> float:
         """Ensure speed is within acceptable range"""
-        return max(cls.MIN_SPEED, min(cls.MAX_SPEED, speed))
+        return max(self.MIN_SPEED, min(self.MAX_SPEED, speed))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Read environment variables once and return the frozen settings"""
+    workers = int(os.getenv("KITTENTTS_WORKERS", 1))
+    return Settings(
+        HOST=os.getenv("KITTENTTS_HOST", "0.0.0.0"),
+        PORT=int(os.getenv("KITTENTTS_PORT", 8001)),
+        LOG_LEVEL=os.getenv("KITTENTTS_LOG_LEVEL", "INFO"),
+        WORKERS=workers,
+        MAX_TEXT_LENGTH=int(os.getenv("KITTENTTS_MAX_TEXT_LENGTH", 4000)),  # Legacy limit for backward compatibility
+        MAX_TOTAL_CHARS=int(os.getenv("KITTENTTS_MAX_TOTAL_CHARS", 50000)),  # Absolute maximum to prevent abuse
+        MAX_CHARS_PER_CHUNK=int(os.getenv("KITTENTTS_MAX_CHARS_PER_CHUNK", 1200)),  # Optimal chunk size for TTS
+        ENABLE_CHUNKING=_env_flag("KITTENTTS_ENABLE_CHUNKING", "true"),
+        USE_GPU=_env_flag("KITTENTTS_USE_GPU", "true"),
+        GPU_PROVIDER=os.getenv("KITTENTTS_GPU_PROVIDER", "auto"),  # auto, coreml, cuda, cpu
+        INT8_CPU=_env_flag("KITTENTTS_INT8", "false"),
+        ONNX_THREADS=int(os.getenv("KITTENTTS_ONNX_THREADS", 0)),  # 0 = auto
+        ONNX_INTRA_OP_THREADS=max(1, (os.cpu_count() or 1) // workers),
+        ONNX_PROVIDERS=_env_providers("KITTENTTS_ONNX_PROVIDERS"),
+        TTS_WORKERS=int(os.getenv("KITTENTTS_TTS_WORKERS", 2)),
+        RESPONSE_CACHE_SIZE=int(os.getenv("KITTENTTS_RESPONSE_CACHE_SIZE", 1024)),  # 0 disables
+        DISK_CACHE_DIR=os.getenv("KITTENTTS_DISK_CACHE_DIR", ""),  # empty disables the disk tier
+        VOICE_MAPPING={
+            "alloy": "expr-voice-5-m",      # Male voice
+            "echo": "expr-voice-2-m",       # Male voice
+            "fable": "expr-voice-3-f",      # Female voice
+            "onyx": "expr-voice-4-m",       # Male voice
+            "nova": "expr-voice-5-f",       # Female voice
+            "shimmer": "expr-voice-2-f"     # Female voice
+        },
+    )
+
+
+# Settings singleton kept under the historical name so existing
+# `from config import Config` imports keep working unchanged.
+Config = get_settings()
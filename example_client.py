@@ -4,16 +4,28 @@ Example client for testing the KittenTTS Server
 """
 
 import requests
+import textwrap
 import time
 import argparse
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 
 class KittenTTSClient:
     """Simple client for KittenTTS Server API"""
-    
+
     def __init__(self, base_url="http://localhost:8001"):
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
+
+        # Raise the connection pool size so concurrent/benchmark loops reuse
+        # keep-alive connections instead of re-doing TCP handshakes
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip"
+        })
     
     def health_check(self):
         """Check server health"""
@@ -45,9 +57,14 @@ class KittenTTSClient:
             print(f"Failed to list voices: {e}")
             return None
     
-    def generate_speech(self, text, voice="alloy", model="tts-1-hd", 
+    def generate_speech(self, text, voice="alloy", model="tts-1-hd",
                        response_format="wav", speed=1.0, output_file=None):
-        """Generate speech from text"""
+        """Generate speech from text
+
+        When output_file is given the response is streamed straight to disk
+        (returning the output Path) instead of buffering the whole audio blob
+        in memory; otherwise the raw bytes are returned.
+        """
         payload = {
             "model": model,
             "input": text,
@@ -55,26 +72,32 @@ class KittenTTSClient:
             "response_format": response_format,
             "speed": speed
         }
-        
+
         try:
-            print(f"Generating speech for: '{text[:50]}{'...' if len(text) > 50 else ''}'")
+            print(f"Generating speech for: '{textwrap.shorten(text, width=53, placeholder='...')}'")
             print(f"Voice: {voice}, Speed: {speed}, Format: {response_format}")
-            
+
             response = self.session.post(
                 f"{self.base_url}/v1/audio/speech",
                 json=payload,
-                timeout=60  # TTS can take a while
+                timeout=60,  # TTS can take a while
+                stream=True
             )
             response.raise_for_status()
-            
+
             if output_file:
                 output_path = Path(output_file)
-                output_path.write_bytes(response.content)
+                file_size = 0
+                with output_path.open("wb") as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+                        file_size += len(chunk)
                 print(f"Audio saved to: {output_path.absolute()}")
-                print(f"File size: {len(response.content)} bytes")
-            
+                print(f"File size: {file_size} bytes")
+                return output_path
+
             return response.content
-            
+
         except requests.RequestException as e:
             print(f"Speech generation failed: {e}")
             if hasattr(e.response, 'text'):
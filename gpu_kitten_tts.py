@@ -3,18 +3,217 @@ GPU-accelerated KittenTTS wrapper with custom ONNX Runtime providers
 """
 
 import os
-import json
 import logging
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
-import onnxruntime as ort
-from huggingface_hub import hf_hub_download
-from kittentts.onnx_model import TextCleaner
-import phonemizer
+
+try:
+    import orjson as _json_impl  # 2-5x faster parse, fewer allocations
+except ImportError:
+    import json as _json_impl
 
 from config import Config
 
+# onnxruntime, huggingface_hub, phonemizer and kittentts are imported lazily
+# inside GPUKittenTTS so that importing this module (e.g. for Config-only
+# tooling or health checks) stays fast.
+
 logger = logging.getLogger(__name__)
 
+# Precompiled tokenizer pattern: words or single punctuation characters
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Single-pass phoneme normalization: spaces every token with one separator,
+# equivalent to ' '.join(_TOKEN_RE.findall(text)) without building the list
+_PHONEME_NORM_RE = re.compile(r"\s*(\w+|[^\w\s])\s*")
+
+def _normalize_phonemes(phonemes: str) -> str:
+    """Collapse whitespace and space out punctuation for the char-level cleaner."""
+    return _PHONEME_NORM_RE.sub(r"\1 ", phonemes).rstrip()
+
+def _tokens_to_input_ids(tokens) -> np.ndarray:
+    """Pack cleaner tokens into a (1, N+2) int64 array framed by pad tokens.
+
+    Avoids the O(N) list shift of tokens.insert(0, 0) and the element-wise
+    PyLong conversion of np.array([list]): zeros() provides the start/end
+    pad tokens and the middle is filled with one C-level copy.
+    """
+    input_ids = np.zeros((1, len(tokens) + 2), dtype=np.int64)
+    input_ids[0, 1:-1] = tokens
+    return input_ids
+
+@lru_cache(maxsize=64)
+def _speed_tensor(speed: float) -> np.ndarray:
+    """Shared read-only (1,) float32 tensor for a given speed.
+
+    Callers overwhelmingly use a handful of speeds (1.0, 1.25, ...), so
+    memoizing avoids allocating a tiny ndarray on every request.
+    """
+    tensor = np.array([speed], dtype=np.float32)
+    tensor.flags.writeable = False
+    return tensor
+
+# Samples of padding the model emits before/after the real audio
+_TRIM_START = 5000
+_TRIM_END = 10000
+
+# Process-wide singleton so the expensive model download / session build /
+# espeak startup happens exactly once per process
+_tts_instance = None
+_tts_lock = threading.Lock()
+
+@lru_cache(maxsize=8)
+def _resolve_model_paths(repo_id, cache_dir):
+    """Resolve (downloading if needed) the model and voices files for a repo.
+
+    Cached so repeat constructions in the same process skip the metadata
+    HEAD requests hf_hub_download makes even for already-cached files.
+    """
+    from huggingface_hub import hf_hub_download
+
+    # Download config file first
+    config_path = hf_hub_download(
+        repo_id=repo_id,
+        filename="config.json",
+        cache_dir=cache_dir
+    )
+
+    # Load config
+    with open(config_path, 'rb') as f:
+        config = _json_impl.loads(f.read())
+
+    if config.get("type") != "ONNX1":
+        raise ValueError(f"Unsupported model type: {config.get('type')}")
+
+    # Download model and voices files
+    model_path = hf_hub_download(
+        repo_id=repo_id,
+        filename=config["model_file"],
+        cache_dir=cache_dir
+    )
+
+    voices_path = hf_hub_download(
+        repo_id=repo_id,
+        filename=config["voices"],
+        cache_dir=cache_dir
+    )
+
+    return model_path, voices_path
+
+def get_tts(**kwargs):
+    """Return the shared GPUKittenTTS instance, creating it on first use."""
+    global _tts_instance
+    if _tts_instance is None:
+        with _tts_lock:
+            if _tts_instance is None:
+                _tts_instance = GPUKittenTTS(**kwargs)
+    return _tts_instance
+
+@lru_cache(maxsize=1)
+def compute_providers():
+    """Determine the best execution providers based on system and configuration.
+
+    Cached at module level: provider availability cannot change within a
+    process, so forked/multi-worker deployments probing it repeatedly get
+    the precomputed tuple.
+    """
+    import onnxruntime as ort
+
+    available_providers = ort.get_available_providers()
+    logger.info("Available ONNX providers: %s", available_providers)
+
+    # Explicit override: honour Config.ONNX_PROVIDERS verbatim, dropping
+    # (with a warning) entries this ORT build doesn't ship
+    if Config.ONNX_PROVIDERS:
+        providers = []
+        for entry in Config.ONNX_PROVIDERS:
+            name = entry[0] if isinstance(entry, tuple) else entry
+            if name in available_providers:
+                providers.append(entry)
+            elif name == 'TensorrtExecutionProvider':
+                logger.warning(
+                    "TensorrtExecutionProvider requested but not available; "
+                    "install onnxruntime-gpu built with TensorRT support"
+                )
+            else:
+                logger.warning("Requested provider %s is not available", name)
+        if not any((p[0] if isinstance(p, tuple) else p) == 'CPUExecutionProvider'
+                   for p in providers):
+            providers.append('CPUExecutionProvider')
+        return tuple(providers)
+
+    if not Config.USE_GPU:
+        logger.info("GPU acceleration disabled by configuration")
+        return ('CPUExecutionProvider',)
+    
+    providers = []
+    
+    # Auto-detect or use specified provider
+    if Config.GPU_PROVIDER.lower() == "auto":
+        # For systems with CUDA support (prioritize CUDA as it works better with TTS models)
+        if 'CUDAExecutionProvider' in available_providers:
+            # TensorRT EP ahead of CUDA when the build ships it: fused
+            # engines are several times faster once the engine cache is warm
+            if 'TensorrtExecutionProvider' in available_providers:
+                providers.append(('TensorrtExecutionProvider', {
+                    "trt_fp16_enable": True,
+                    "trt_engine_cache_enable": True,
+                    "trt_engine_cache_path": "/tmp/trt",
+                }))
+                logger.info("Using TensorRT acceleration with CUDA fallback")
+            # HEURISTIC conv algo search skips the exhaustive cudnn autotune
+            # that dominates first-call latency on small TTS convolutions
+            providers.append(('CUDAExecutionProvider', {
+                "cudnn_conv_algo_search": "HEURISTIC",
+                "do_copy_in_default_stream": True,
+            }))
+            logger.info("Using CUDA GPU acceleration (cudnn_conv_algo_search=HEURISTIC)")
+
+        # For Apple Silicon - CoreML has issues with dynamic shapes in TTS models
+        # Use optimized CPU instead for better performance
+        elif 'CoreMLExecutionProvider' in available_providers:
+            logger.info("CoreML available but may have compatibility issues with TTS models")
+            logger.info("Using optimized CPU execution for better reliability")
+            # Don't add CoreML for now due to model compatibility issues
+            
+        # For Intel/AMD systems with OpenVINO
+        elif 'OpenVINOExecutionProvider' in available_providers:
+            providers.append('OpenVINOExecutionProvider')
+            logger.info("Using OpenVINO acceleration")
+            
+    elif Config.GPU_PROVIDER.lower() == "coreml":
+        if 'CoreMLExecutionProvider' in available_providers:
+            # MLProgram with dynamic shapes allowed: the legacy NeuralNetwork
+            # format silently places most of this graph back on CPU when the
+            # sequence length is symbolic, which looks like CoreML "working"
+            # while running at CPU speed
+            providers.append(('CoreMLExecutionProvider', {
+                "ModelFormat": "MLProgram",
+                "MLComputeUnits": "CPUAndGPU",
+                "RequireStaticInputShapes": "0",
+            }))
+            logger.warning("CoreML requested - may have compatibility issues with this TTS model")
+        else:
+            logger.warning("CoreML provider requested but not available")
+            
+    elif Config.GPU_PROVIDER.lower() == "cuda":
+        if 'CUDAExecutionProvider' in available_providers:
+            providers.append(('CUDAExecutionProvider', {
+                "cudnn_conv_algo_search": "HEURISTIC",
+                "do_copy_in_default_stream": True,
+            }))
+        else:
+            logger.warning("CUDA provider requested but not available")
+    
+    # Always add CPU as fallback with optimizations
+    providers.append('CPUExecutionProvider')
+    
+    return tuple(providers)
+
 class GPUKittenTTS:
     """GPU-accelerated KittenTTS with custom execution providers."""
     
@@ -25,17 +224,44 @@ class GPUKittenTTS:
             model_name: Hugging Face repository ID or model name
             cache_dir: Directory to cache downloaded files
         """
+        import onnxruntime as ort
+        import phonemizer
+        from kittentts.onnx_model import TextCleaner
+
         self.model_name = model_name
         self.cache_dir = cache_dir
-        
+
         # Download model files
         self.model_path, self.voices_path = self._download_model()
-        
+
+        # Bake the fixed padding trim into the graph so the runtime never
+        # materializes those samples; fall back to a Python-side slice
+        trimmed_model_path = self._bake_trim_into_graph(self.model_path)
+        self._trim_baked = trimmed_model_path is not None
+        if self._trim_baked:
+            self.model_path = trimmed_model_path
+
+        # Optional INT8 weights for CPU-only deployments (~1.5x RTF gain
+        # at a small quality cost, which is why it's opt-in). The quantized
+        # weights back the "tts-1" fast tier; "tts-1-hd" keeps fp32
+        self._int8_model_path = None
+        if Config.INT8_CPU and not Config.USE_GPU:
+            self._int8_model_path = self._quantize_for_cpu(self.model_path)
+
+
         # Load voices data
         self.voices = np.load(self.voices_path)
+
+        # Preload every voice vector into RAM once: indexing an NpzFile
+        # decompresses the member on each access, which would otherwise
+        # happen per request in the hot path
+        voice_names = getattr(self.voices, 'files', None) or list(self.voices.keys())
+        self._voice_cache = {
+            name: np.ascontiguousarray(self.voices[name]) for name in voice_names
+        }
         
         # Setup execution providers based on configuration
-        providers = self._get_execution_providers()
+        providers = list(compute_providers())
         
         # Create ONNX Runtime session with optimizations
         session_options = ort.SessionOptions()
@@ -44,6 +270,13 @@ class GPUKittenTTS:
         if Config.ONNX_THREADS > 0:
             session_options.intra_op_num_threads = Config.ONNX_THREADS
             session_options.inter_op_num_threads = Config.ONNX_THREADS
+        elif Config.WORKERS > 1:
+            # Multi-worker deployments: give each worker its share of the
+            # cores so the ORT thread pools don't oversubscribe the machine
+            session_options.intra_op_num_threads = Config.ONNX_INTRA_OP_THREADS
+            session_options.inter_op_num_threads = 1
+            logger.info("Co-tuned ORT threads for %d workers (%d intra-op each)",
+                        Config.WORKERS, Config.ONNX_INTRA_OP_THREADS)
         else:
             # Auto-configure based on system
             import platform
@@ -57,11 +290,33 @@ class GPUKittenTTS:
                 pass
         
         # Enable optimizations
+        provider_names = [p[0] if isinstance(p, tuple) else p for p in providers]
+        uses_cuda = ('CUDAExecutionProvider' in provider_names
+                     or 'TensorrtExecutionProvider' in provider_names)
         session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-        session_options.enable_cpu_mem_arena = True
+        # Sequential execution (the ORT default, pinned here on purpose):
+        # this graph is a single chain, so parallel mode would only add
+        # inter-op scheduling overhead
+        session_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # Persist the fused graph next to the model so later process starts
+        # load it directly and skip the fusion pass. Only safe for CPU
+        # sessions: GPU EPs bake provider-specific fusions into the dump.
+        if not uses_cuda:
+            optimized_path = f"{self.model_path}.opt.onnx"
+            if os.path.exists(optimized_path):
+                self.model_path = optimized_path
+                logger.info("Loading pre-optimized graph: %s", optimized_path)
+            else:
+                session_options.optimized_model_filepath = optimized_path
+        # On CUDA the CPU arena only stages host copies and grows unbounded,
+        # so leave it off there and keep it for pure-CPU sessions
+        session_options.enable_cpu_mem_arena = not uses_cuda
         session_options.enable_mem_pattern = True
+        # Share the memory arena via environment allocators so it survives
+        # session re-creation
+        session_options.add_session_config_entry("session.use_env_allocators", "1")
         
-        logger.info(f"Creating ONNX session with providers: {providers}")
+        logger.info("Creating ONNX session with providers: %s", providers)
         
         try:
             self.session = ort.InferenceSession(
@@ -72,75 +327,94 @@ class GPUKittenTTS:
             
             # Log which provider was actually selected
             actual_providers = self.session.get_providers()
-            logger.info(f"ONNX session created successfully with providers: {actual_providers}")
+            logger.info("ONNX session created successfully with providers: %s", actual_providers)
             
         except Exception as e:
-            logger.warning(f"Failed to create session with preferred providers, falling back to CPU: {e}")
+            logger.warning("Failed to create session with preferred providers, falling back to CPU: %s", e)
             self.session = ort.InferenceSession(
                 self.model_path,
                 sess_options=session_options,
                 providers=['CPUExecutionProvider']
             )
-        
+
+        # Second session over the INT8 weights, serving model="tts-1".
+        # Fresh SessionOptions on purpose: reusing the fp32 options would
+        # point optimized_model_filepath at the fp32 cache file and clobber
+        # it with the quantized graph.
+        self.fast_session = None
+        if self._int8_model_path is not None:
+            try:
+                fast_options = ort.SessionOptions()
+                fast_options.intra_op_num_threads = session_options.intra_op_num_threads
+                fast_options.inter_op_num_threads = session_options.inter_op_num_threads
+                fast_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                fast_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+                self.fast_session = ort.InferenceSession(
+                    self._int8_model_path,
+                    sess_options=fast_options,
+                    providers=['CPUExecutionProvider']
+                )
+                logger.info("INT8 fast tier loaded for model=tts-1: %s", self._int8_model_path)
+            except Exception as e:
+                logger.warning("Could not load INT8 fast tier, tts-1 will use fp32: %s", e)
+
+
         # Initialize phonemizer and text cleaner
         self.phonemizer = phonemizer.backend.EspeakBackend(
             language="en-us", preserve_punctuation=True, with_stress=True
         )
         self.text_cleaner = TextCleaner()
-        
+
+        # Cache text -> token IDs so repeated prompts (retries, UI strings,
+        # boilerplate chunks) skip the espeak subprocess roundtrip entirely.
+        # A hand-rolled LRU rather than functools.lru_cache so the batch
+        # path can probe for hits without triggering per-miss phonemize
+        # calls — misses are phonemized together in one espeak roundtrip.
+        self._input_ids_cache = OrderedDict()
+        self._input_ids_cache_size = 4096
+        self._cache_hits = 0
+        self._cache_misses = 0
+
         # Available voices
         self.available_voices = [
             'expr-voice-2-m', 'expr-voice-2-f', 'expr-voice-3-m', 'expr-voice-3-f',
             'expr-voice-4-m', 'expr-voice-4-f', 'expr-voice-5-m', 'expr-voice-5-f'
         ]
-    
-    def _get_execution_providers(self):
-        """Determine the best execution providers based on system and configuration."""
-        available_providers = ort.get_available_providers()
-        logger.info(f"Available ONNX providers: {available_providers}")
-        
-        if not Config.USE_GPU:
-            logger.info("GPU acceleration disabled by configuration")
-            return ['CPUExecutionProvider']
-        
-        providers = []
-        
-        # Auto-detect or use specified provider
-        if Config.GPU_PROVIDER.lower() == "auto":
-            # For systems with CUDA support (prioritize CUDA as it works better with TTS models)
-            if 'CUDAExecutionProvider' in available_providers:
-                providers.append('CUDAExecutionProvider')
-                logger.info("Using CUDA GPU acceleration")
-                
-            # For Apple Silicon - CoreML has issues with dynamic shapes in TTS models
-            # Use optimized CPU instead for better performance
-            elif 'CoreMLExecutionProvider' in available_providers:
-                logger.info("CoreML available but may have compatibility issues with TTS models")
-                logger.info("Using optimized CPU execution for better reliability")
-                # Don't add CoreML for now due to model compatibility issues
-                
-            # For Intel/AMD systems with OpenVINO
-            elif 'OpenVINOExecutionProvider' in available_providers:
-                providers.append('OpenVINOExecutionProvider')
-                logger.info("Using OpenVINO acceleration")
-                
-        elif Config.GPU_PROVIDER.lower() == "coreml":
-            if 'CoreMLExecutionProvider' in available_providers:
-                providers.append('CoreMLExecutionProvider')
-                logger.warning("CoreML requested - may have compatibility issues with this TTS model")
-            else:
-                logger.warning("CoreML provider requested but not available")
-                
-        elif Config.GPU_PROVIDER.lower() == "cuda":
-            if 'CUDAExecutionProvider' in available_providers:
-                providers.append('CUDAExecutionProvider')
-            else:
-                logger.warning("CUDA provider requested but not available")
-        
-        # Always add CPU as fallback with optimizations
-        providers.append('CPUExecutionProvider')
-        
-        return providers
+        # Hash-based lookup for the hot-path membership check; the list
+        # above stays as-is for the API listing endpoints
+        self._voice_set = frozenset(self.available_voices)
+
+        # Persistent OrtValues for the inputs that repeat across calls
+        # (per-voice style vectors, common speeds). input_ids still varies
+        # per call: the graph has no attention-mask input, so padding it to
+        # fixed-length buckets would lengthen the synthesized audio.
+        # On CUDA sessions the cached values live on the device, so the
+        # per-call run skips the host->device Memcpy nodes entirely.
+        self._binding_device = (
+            'cuda' if 'CUDAExecutionProvider' in self.session.get_providers() else 'cpu'
+        )
+        self._style_ortvalues = {}
+        self._speed_ortvalues = {}
+        self._output_names = [output.name for output in self.session.get_outputs()]
+
+        # Warm the session so the first user request doesn't pay the
+        # allocator / kernel-selection / memory-pattern initialization cost.
+        # Several input lengths pre-populate shape-dependent state (TRT
+        # engine cache, CUDA autotune) for short, medium and long utterances.
+        try:
+            for phrase in (
+                "Warming up.",
+                "Warming up the synthesis engine with a medium length sentence.",
+                "Warming up the synthesis engine with a considerably longer "
+                "sentence, so kernels tuned for long inputs are compiled and "
+                "cached before the first real request ever arrives.",
+            ):
+                self.session.run(None, self._prepare_inputs(phrase, "expr-voice-5-m", 1.0))
+            if self.fast_session is not None:
+                self.fast_session.run(None, self._prepare_inputs("Warming up.", "expr-voice-5-m", 1.0))
+            logger.info("ONNX session warmed up")
+        except Exception as e:
+            logger.warning("Session warmup failed (non-fatal): %s", e)
     
     def _download_model(self):
         """Download model files from Hugging Face."""
@@ -149,100 +423,368 @@ class GPUKittenTTS:
             repo_id = f"KittenML/{self.model_name}"
         else:
             repo_id = self.model_name
-        
-        # Download config file first
-        config_path = hf_hub_download(
-            repo_id=repo_id,
-            filename="config.json",
-            cache_dir=self.cache_dir
-        )
-        
-        # Load config
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        
-        if config.get("type") != "ONNX1":
-            raise ValueError(f"Unsupported model type: {config.get('type')}")
-        
-        # Download model and voices files
-        model_path = hf_hub_download(
-            repo_id=repo_id,
-            filename=config["model_file"],
-            cache_dir=self.cache_dir
-        )
-        
-        voices_path = hf_hub_download(
-            repo_id=repo_id,
-            filename=config["voices"],
-            cache_dir=self.cache_dir
-        )
-        
-        return model_path, voices_path
+
+        return _resolve_model_paths(repo_id, self.cache_dir)
     
-    def _basic_english_tokenize(self, text):
+    def _bake_trim_into_graph(self, model_path):
+        """Rewrite the model so the padding trim happens inside the graph.
+
+        Appends a Slice node equivalent to audio[_TRIM_START:-_TRIM_END] to
+        the audio output and caches the rewritten model next to the original.
+
+        Returns:
+            Path to the rewritten model, or None if rewriting isn't possible
+        """
+        try:
+            import onnx
+            from onnx import helper
+        except ImportError:
+            logger.info("onnx package not available, trimming audio in Python instead")
+            return None
+
+        trimmed_path = f"{model_path}.trimmed.onnx"
+        if os.path.exists(trimmed_path):
+            return trimmed_path
+
+        try:
+            model = onnx.load(model_path)
+            graph = model.graph
+
+            audio_output = graph.output[0]
+            trimmed_name = f"{audio_output.name}_trimmed"
+
+            graph.initializer.extend([
+                helper.make_tensor("trim_starts", onnx.TensorProto.INT64, [1], [_TRIM_START]),
+                helper.make_tensor("trim_ends", onnx.TensorProto.INT64, [1], [-_TRIM_END]),
+                helper.make_tensor("trim_axes", onnx.TensorProto.INT64, [1], [0]),
+            ])
+            graph.node.append(helper.make_node(
+                "Slice",
+                inputs=[audio_output.name, "trim_starts", "trim_ends", "trim_axes"],
+                outputs=[trimmed_name],
+                name="audio_trim"
+            ))
+
+            # Re-point the audio output at the trimmed tensor (shape unknown)
+            elem_type = audio_output.type.tensor_type.elem_type
+            graph.output.remove(audio_output)
+            graph.output.insert(0, helper.make_tensor_value_info(trimmed_name, elem_type, None))
+
+            onnx.save(model, trimmed_path)
+            logger.info("Baked audio trim into ONNX graph: %s", trimmed_path)
+            return trimmed_path
+
+        except Exception as e:
+            logger.warning("Could not bake trim into ONNX graph, falling back to Python slice: %s", e)
+            return None
+
+    def _quantize_for_cpu(self, model_path):
+        """Dynamically quantize the model's weights to INT8 for CPU inference.
+
+        The quantized model is cached next to the original, so the (slow)
+        quantization pass runs once per downloaded model, not per process.
+
+        Returns:
+            Path to the INT8 model, or None if quantization isn't possible
+        """
+        try:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError:
+            logger.info("onnxruntime.quantization not available, keeping fp32 weights")
+            return None
+
+        int8_path = f"{model_path}.int8.onnx"
+        if os.path.exists(int8_path):
+            return int8_path
+
+        try:
+            quantize_dynamic(
+                model_path,
+                int8_path,
+                weight_type=QuantType.QInt8,
+                op_types_to_quantize=["MatMul", "Gemm", "Attention"],
+            )
+            logger.info("Quantized model weights to INT8: %s", int8_path)
+            return int8_path
+        except Exception as e:
+            logger.warning("INT8 quantization failed, keeping fp32 weights: %s", e)
+            return None
+
+    def _session_for(self, model: str):
+        """Map an API model name to a session: "tts-1" rides the INT8 fast
+        tier when it's loaded, everything else gets the full-precision one."""
+        if model == "tts-1" and self.fast_session is not None:
+            return self.fast_session
+        return self.session
+
+    def _run_inference(self, onnx_inputs, voice, session=None):
+        """Run the session via IO binding, reusing per-voice style buffers.
+
+        Style and speed tensors never change between calls for a given voice
+        and speed, so they are bound from cached OrtValues instead of being
+        re-marshalled from numpy each run. Falls back to a plain session.run
+        if IO binding fails for any reason.
+
+        Returns:
+            The raw (untrimmed) audio output array
+        """
+        if session is None:
+            session = self.session
+        try:
+            import onnxruntime as ort
+
+            io_binding = session.io_binding()
+            device = self._binding_device
+
+            input_ids = ort.OrtValue.ortvalue_from_numpy(onnx_inputs["input_ids"], device, 0)
+            io_binding.bind_ortvalue_input("input_ids", input_ids)
+
+            style = self._style_ortvalues.get(voice)
+            if style is None:
+                style = ort.OrtValue.ortvalue_from_numpy(
+                    np.ascontiguousarray(onnx_inputs["style"]), device, 0
+                )
+                self._style_ortvalues[voice] = style
+            io_binding.bind_ortvalue_input("style", style)
+
+            speed_key = float(onnx_inputs["speed"][0])
+            speed = self._speed_ortvalues.get(speed_key)
+            if speed is None:
+                speed = ort.OrtValue.ortvalue_from_numpy(onnx_inputs["speed"], device, 0)
+                if len(self._speed_ortvalues) < 64:
+                    self._speed_ortvalues[speed_key] = speed
+            io_binding.bind_ortvalue_input("speed", speed)
+
+            # Let ORT allocate outputs on the execution device; the single
+            # copy_outputs_to_cpu below is the only device->host transfer
+            for output_name in self._output_names:
+                io_binding.bind_output(output_name, device)
+
+            session.run_with_iobinding(io_binding)
+            return io_binding.copy_outputs_to_cpu()[0]
+
+        except Exception as e:
+            logger.debug("IO binding run failed (%s), using session.run", e)
+            return session.run(None, onnx_inputs)[0]
+
+    def _trim_audio(self, audio):
+        """Strip the model's padding unless the graph already slices it off."""
+        if self._trim_baked:
+            return audio
+        return audio[_TRIM_START:-_TRIM_END]
+
+    @staticmethod
+    def _basic_english_tokenize(text):
         """Basic English tokenizer that splits on whitespace and punctuation."""
-        import re
-        tokens = re.findall(r"\w+|[^\w\s]", text)
-        return tokens
+        return _TOKEN_RE.findall(text)
     
+    def _tokenize_text(self, text: str) -> np.ndarray:
+        """Convert text to a (1, N+2) int64 input_ids array (phonemize + clean).
+
+        The array is marked read-only so cached results stay immutable.
+        """
+        # Phonemize the input text
+        phonemes_list = self.phonemizer.phonemize([text])
+
+        # Process phonemes to get token IDs, framed by start/end pad tokens
+        tokens = self.text_cleaner(_normalize_phonemes(phonemes_list[0]))
+        input_ids = _tokens_to_input_ids(tokens)
+        input_ids.flags.writeable = False
+        return input_ids
+
+    def _cache_lookup(self, text: str):
+        """Return cached input_ids for text, or None on a miss."""
+        input_ids = self._input_ids_cache.get(text)
+        if input_ids is not None:
+            self._input_ids_cache.move_to_end(text)
+            self._cache_hits += 1
+        else:
+            self._cache_misses += 1
+        return input_ids
+
+    def _cache_store(self, text: str, input_ids: np.ndarray):
+        """Insert input_ids for text, evicting the least recently used."""
+        self._input_ids_cache[text] = input_ids
+        while len(self._input_ids_cache) > self._input_ids_cache_size:
+            self._input_ids_cache.popitem(last=False)
+
+    def _tokenize_cached(self, text: str) -> np.ndarray:
+        """Tokenize through the shared LRU cache."""
+        input_ids = self._cache_lookup(text)
+        if input_ids is None:
+            input_ids = self._tokenize_text(text)
+            self._cache_store(text, input_ids)
+        return input_ids
+
+    def prefetch_tokenize(self, texts) -> None:
+        """Phonemize any uncached texts in one espeak roundtrip and cache them.
+
+        Meant to run on a spare executor thread while inference for an
+        earlier text occupies another: the session releases the GIL inside
+        its native compute, so the espeak roundtrip for upcoming texts hides
+        behind it and later generate() calls hit the tokenize cache.
+        Failures are swallowed — the normal per-text path re-tokenizes.
+        """
+        misses = [text for text in texts if text not in self._input_ids_cache]
+        if not misses:
+            return
+        try:
+            phonemes_list = self.phonemizer.phonemize(misses)
+            for text, phonemes_str in zip(misses, phonemes_list):
+                tokens = self.text_cleaner(_normalize_phonemes(phonemes_str))
+                input_ids = _tokens_to_input_ids(tokens)
+                input_ids.flags.writeable = False
+                self._cache_store(text, input_ids)
+        except Exception as e:
+            logger.debug("Tokenize prefetch failed (non-fatal): %s", e)
+
     def _prepare_inputs(self, text: str, voice: str, speed: float = 1.0) -> dict:
         """Prepare ONNX model inputs from text and voice parameters."""
-        if voice not in self.available_voices:
+        if voice not in self._voice_set:
             raise ValueError(f"Voice '{voice}' not available. Choose from: {self.available_voices}")
-        
-        # Phonemize the input text
-        phonemes_list = self.phonemizer.phonemize([text])
-        
-        # Process phonemes to get token IDs
-        phonemes = self._basic_english_tokenize(phonemes_list[0])
-        phonemes = ' '.join(phonemes)
-        tokens = self.text_cleaner(phonemes)
-        
-        # Add start and end tokens
-        tokens.insert(0, 0)
-        tokens.append(0)
-        
-        input_ids = np.array([tokens], dtype=np.int64)
-        ref_s = self.voices[voice]
+
+        input_ids = self._tokenize_cached(text)
+        ref_s = self._voice_cache[voice]
         
         return {
             "input_ids": input_ids,
             "style": ref_s,
-            "speed": np.array([speed], dtype=np.float32),
+            "speed": _speed_tensor(round(float(speed), 3)),
         }
     
-    def generate(self, text: str, voice: str = "expr-voice-5-m", speed: float = 1.0) -> np.ndarray:
+    def generate(self, text: str, voice: str = "expr-voice-5-m", speed: float = 1.0,
+                 model: str = "tts-1-hd") -> np.ndarray:
         """Synthesize speech from text with GPU acceleration.
-        
+
         Args:
             text: Input text to synthesize
             voice: Voice to use for synthesis
             speed: Speech speed (1.0 = normal)
-            
+            model: API model name; "tts-1" selects the INT8 fast tier
+
         Returns:
             Audio data as numpy array
         """
         try:
             # Prepare inputs
             onnx_inputs = self._prepare_inputs(text, voice, speed)
-            
+
             # Run inference on GPU/accelerated device
-            outputs = self.session.run(None, onnx_inputs)
-            
+            audio = self._run_inference(onnx_inputs, voice, self._session_for(model))
+
             # Trim audio (remove padding)
-            audio = outputs[0][5000:-10000]
-            
-            return audio
+            return self._trim_audio(audio)
             
         except Exception as e:
-            logger.error(f"Error during TTS generation: {e}")
+            logger.error("Error during TTS generation: %s", e)
             raise
     
+    def generate_wav_bytes(self, text: str, voice: str = "expr-voice-5-m", speed: float = 1.0,
+                           sample_rate: int = None, model: str = "tts-1-hd") -> bytes:
+        """Synthesize speech and encode it as 16-bit PCM WAV in one pass.
+
+        Converts float audio straight to PCM16 in memory, so callers that
+        want WAV bytes skip the float-array -> temp-file -> bytes round trip.
+
+        Args:
+            text: Input text to synthesize
+            voice: Voice to use for synthesis
+            speed: Speech speed (1.0 = normal)
+            sample_rate: Output sample rate (defaults to Config.DEFAULT_SAMPLE_RATE)
+            model: API model name; "tts-1" selects the INT8 fast tier
+
+        Returns:
+            Complete WAV file contents as bytes
+        """
+        from audio_encoder import encode_audio
+
+        if sample_rate is None:
+            sample_rate = Config.DEFAULT_SAMPLE_RATE
+
+        audio = np.asarray(
+            self.generate(text, voice=voice, speed=speed, model=model), dtype=np.float32
+        )
+        audio_bytes, _ = encode_audio(audio, sample_rate, "wav")
+        return audio_bytes
+
+    def generate_batch(self, texts, voice: str = "expr-voice-5-m", speed: float = 1.0,
+                       model: str = "tts-1-hd") -> list:
+        """Synthesize speech for several texts with a single phonemizer call.
+
+        EspeakBackend.phonemize accepts a list and amortizes the espeak
+        subprocess startup across all inputs, so chunked requests avoid one
+        roundtrip per chunk.
+
+        Inference itself stays one run per text: the graph takes no
+        attention mask, so padding token sequences to a shared length would
+        synthesize the pad positions as audible audio rather than ignoring
+        them. A single padded batch run needs an upstream model export with
+        masking before it can land here.
+
+        Args:
+            texts: List of input texts to synthesize
+            voice: Voice to use for synthesis
+            speed: Speech speed (1.0 = normal)
+            model: API model name; "tts-1" selects the INT8 fast tier
+
+        Returns:
+            List of audio arrays, one per input text
+        """
+        if voice not in self._voice_set:
+            raise ValueError(f"Voice '{voice}' not available. Choose from: {self.available_voices}")
+
+        if not texts:
+            return []
+
+        try:
+            # Probe the tokenize cache first; only the misses share the
+            # single espeak roundtrip below
+            input_ids_list = [self._cache_lookup(text) for text in texts]
+            miss_indices = [i for i, ids in enumerate(input_ids_list) if ids is None]
+
+            if miss_indices:
+                phonemes_list = self.phonemizer.phonemize(
+                    [texts[i] for i in miss_indices]
+                )
+                for i, phonemes_str in zip(miss_indices, phonemes_list):
+                    tokens = self.text_cleaner(_normalize_phonemes(phonemes_str))
+                    input_ids = _tokens_to_input_ids(tokens)
+                    input_ids.flags.writeable = False
+                    self._cache_store(texts[i], input_ids)
+                    input_ids_list[i] = input_ids
+
+            session = self._session_for(model)
+            audio_segments = []
+            for input_ids in input_ids_list:
+                onnx_inputs = {
+                    "input_ids": input_ids,
+                    "style": self._voice_cache[voice],
+                    "speed": _speed_tensor(round(float(speed), 3)),
+                }
+
+                audio = self._run_inference(onnx_inputs, voice, session)
+                audio_segments.append(self._trim_audio(audio))
+
+            return audio_segments
+
+        except Exception as e:
+            logger.error("Error during batched TTS generation: %s", e)
+            raise
+
     def get_performance_info(self) -> dict:
         """Get information about the current execution setup."""
         return {
             "providers": self.session.get_providers(),
+            # Actual per-provider options (not what was requested), so a
+            # silent fallback to defaults shows up in /gpu/status
+            "provider_options": self.session.get_provider_options(),
+            "tokenize_cache": {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._input_ids_cache),
+            },
             "model_path": self.model_path,
+            "int8_fast_tier": self.fast_session is not None,
             "voices_count": len(self.available_voices),
             "gpu_enabled": Config.USE_GPU,
             "gpu_provider": Config.GPU_PROVIDER,
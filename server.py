@@ -4,51 +4,358 @@ KittenTTS FastAPI Server for Open WebUI Integration
 Provides OpenAI-compatible TTS API endpoints.
 """
 
-import io
 import os
-import tempfile
+
+# Cap BLAS/OpenMP pools before any numeric import: each concurrent request
+# spinning up a per-op thread team oversubscribes the cores under load.
+# setdefault keeps explicit operator overrides working; ORT's own pools
+# are tuned separately via KITTENTTS_ONNX_THREADS.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+import asyncio
+import hashlib
+import queue
+import re
+import struct
+import time
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
 import numpy as np
-from typing import Literal, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Literal, Optional
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
+from starlette.middleware.gzip import GZipMiddleware
+
+try:
+    import orjson  # noqa: F401 - only used to detect availability
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultJSONResponse
 from contextlib import asynccontextmanager
-from pydantic import BaseModel
-import soundfile as sf
+from pydantic import BaseModel, ConfigDict
 import uvicorn
 
+from audio_encoder import encode_audio
 from config import Config
-from text_processor import TextChunker, validate_text_input
-
-@dataclass
-class AudioData:
-    array: Any
-    sample_rate: int
-    dtype: Any
-    shape: Tuple[int, ...]
-    
-    def __array__(self):
-        return self.array
+from text_processor import chunk_text_cached, validate_text_input
+
+# Configure logging off the request path: the stream handler runs on a
+# background QueueListener thread, so request-path log calls are just
+# lock-free queue puts instead of blocking stderr writes
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(
+    _log_queue, logging.StreamHandler(), respect_handler_level=True
+)
+_log_listener.start()
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(getattr(logging, Config.LOG_LEVEL.upper()))
+_root_logger.addHandler(QueueHandler(_log_queue))
 
-# Configure logging
-logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL.upper()))
 logger = logging.getLogger(__name__)
 
 # Global TTS model instance
 tts_model = None
 
+# Bounded pool for blocking TTS inference and audio encoding; keeps the
+# asyncio event loop free to accept requests and serve /health
+TTS_EXECUTOR = ThreadPoolExecutor(max_workers=Config.TTS_WORKERS, thread_name_prefix="tts")
+
+# Request batcher, started in lifespan when the model supports batching
+tts_batcher = None
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes with orjson when available"""
+    try:
+        import orjson
+        return orjson.dumps(obj)
+    except ImportError:
+        import json
+        return json.dumps(obj).encode()
+
+# Pre-serialized static responses: health probes and OpenAI clients hit
+# these endpoints constantly, so serve bytes instead of re-encoding dicts
+_ROOT_JSON = _dumps({
+    "message": "KittenTTS API Server",
+    "status": "running",
+    "version": "1.0.0",
+    "endpoints": {
+        "speech": "/v1/audio/speech",
+        "models": "/v1/models",
+        "voices": "/v1/audio/voices",
+        "health": "/health"
+    }
+})
+
+_MODELS_JSON = _dumps({
+    "object": "list",
+    "data": [
+        {
+            "id": "tts-1",
+            "object": "model",
+            "created": 1677610602,
+            "owned_by": "kittentts"
+        },
+        {
+            "id": "tts-1-hd",
+            "object": "model",
+            "created": 1677610602,
+            "owned_by": "kittentts"
+        }
+    ]
+})
+
+# Voices response bytes, built on first request and reset on model reload
+_voices_json = None
+
+# /gpu/status payload cache: (expires_at, bytes, model identity)
+_gpu_status_cache = None
+_GPU_STATUS_TTL = 5.0
+
+# Static per-format content types, built once instead of per request
+CONTENT_TYPES = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "opus": "audio/opus",
+    "aac": "audio/aac",
+    "flac": "audio/flac",
+    "pcm": "audio/pcm"
+}
+
+# Fixed Content-Disposition strings: one per format, built once instead of
+# an f-string interpolation per request
+CONTENT_DISPOSITION = {
+    ext: f"attachment; filename=speech.{ext}" for ext in CONTENT_TYPES
+}
+
+# Bound method lookups for the hot path
+_VOICE_GET = Config.VOICE_MAPPING.get
+
+# Formats whose encoded chunks concatenate into a valid stream (raw PCM,
+# MP3 frame sequences, chained Ogg pages) and their streaming media types.
+# WAV streams as one open-ended RIFF header followed by raw PCM chunks.
+_STREAMABLE_FORMATS = {
+    "pcm": "audio/pcm",
+    "mp3": "audio/mpeg",
+    "opus": "audio/ogg",
+    "wav": "audio/wav",
+}
+
+def _wav_stream_header(sample_rate: int) -> bytes:
+    """Mono PCM16 WAV header with unknown (maximal) data length.
+
+    Streaming responses can't know the final size up front; players treat
+    the 0xFFFFFFFF chunk sizes as "read until EOF", per common practice
+    for live WAV streams.
+    """
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 0xFFFFFFFF, b'WAVE',
+        b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b'data', 0xFFFFFFFF,
+    )
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Inter-chunk silence buffers keyed by (sample_rate, dtype) so the zeros
+# allocation happens once per configuration, not once per request
+_silence_cache = {}
+
+def _chunk_silence(sample_rate: int, dtype) -> np.ndarray:
+    """Return the shared 0.1 s silence buffer for this rate and dtype"""
+    key = (sample_rate, np.dtype(dtype).str)
+    silence = _silence_cache.get(key)
+    if silence is None:
+        silence = np.zeros(int(sample_rate * 0.1), dtype=dtype)
+        silence.flags.writeable = False
+        _silence_cache[key] = silence
+    return silence
+
+def _merge_segments(segments, sample_rate: int) -> np.ndarray:
+    """Join audio segments with 0.1 s of silence between them.
+
+    Writes every segment into one pre-sized output array at a running
+    offset (C-level copies), instead of interleaving 2N-1 buffers through
+    np.concatenate — halving peak memory during the merge.
+    """
+    silence = _chunk_silence(sample_rate, segments[0].dtype)
+    gap = silence.size
+    total = sum(s.size for s in segments) + (len(segments) - 1) * gap
+
+    out = np.empty(total, dtype=segments[0].dtype)
+    offset = 0
+    for i, segment in enumerate(segments):
+        out[offset:offset + segment.size] = segment
+        offset += segment.size
+        if i < len(segments) - 1:
+            out[offset:offset + gap] = silence
+            offset += gap
+    return out
+
+def _as_np(audio) -> np.ndarray:
+    """Normalize a model output to an ndarray without a defensive copy"""
+    if isinstance(audio, np.ndarray):
+        return audio
+    if hasattr(audio, 'numpy'):
+        return audio.numpy()
+    return np.asarray(audio)
+
+def _assemble_segments(raw_segments):
+    """Convert raw model outputs to arrays and merge them with silence gaps.
+
+    Runs on the executor: it touches every sample of every segment, which
+    would otherwise block the event loop for long multi-chunk requests.
+
+    Returns:
+        Tuple of (merged_audio, sample_rate)
+    """
+    sample_rate = getattr(raw_segments[0], 'sample_rate', 22050)
+
+    # Hold intermediates as fp16: halves bandwidth and peak RAM for the
+    # (memory-bound) merge of long multi-chunk outputs, at ~66 dB SNR —
+    # inaudible against the model's own synthesis noise floor
+    segments = [
+        _as_np(chunk_audio).astype(np.float16, copy=False)
+        for chunk_audio in raw_segments
+    ]
+
+    return _merge_segments(segments, sample_rate), sample_rate
+
+def split_sentences(text: str) -> list:
+    """Split text on sentence boundaries for incremental synthesis"""
+    return [s for s in _SENTENCE_SPLIT_RE.split(text.strip()) if s]
+
+# Response cache: repeated prompts (canned bot replies, retries) skip both
+# inference and encoding. L1 is an in-process LRU of the final encoded
+# bytes; the optional disk tier survives restarts.
+_response_cache = OrderedDict()
+
+_disk_cache = None
+if Config.DISK_CACHE_DIR:
+    try:
+        import diskcache
+        _disk_cache = diskcache.Cache(Config.DISK_CACHE_DIR, size_limit=1 << 30)
+    except ImportError:
+        logger.warning("KITTENTTS_DISK_CACHE_DIR set but diskcache is not installed")
+
+def _cache_key(text: str, voice: str, speed: float, format_ext: str,
+               model: str = "tts-1-hd") -> bytes:
+    """Stable digest for a (text, voice, speed, format, model tier) combination"""
+    raw = f"{text}|{voice}|{speed}|{format_ext}|{model}".encode()
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+def _cache_get(key: bytes):
+    """Look up encoded audio in the LRU, falling back to the disk tier"""
+    value = _response_cache.get(key)
+    if value is not None:
+        _response_cache.move_to_end(key)
+        return value
+    if _disk_cache is not None:
+        value = _disk_cache.get(key)
+        if value is not None:
+            _cache_put(key, value)
+            return value
+    return None
+
+def _cache_put(key: bytes, value):
+    """Store (audio_bytes, format, content_type) in both cache tiers"""
+    if Config.RESPONSE_CACHE_SIZE <= 0:
+        return
+    _response_cache[key] = value
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > Config.RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+    if _disk_cache is not None:
+        _disk_cache.set(key, value)
+
+class TTSBatcher:
+    """Collects concurrent speech requests into short-lived batches.
+
+    Pending requests are drained as soon as max_batch_size accumulate or
+    max_queue_time elapses, then grouped by (voice, speed, model) so each
+    group becomes one generate_batch call — amortizing the espeak roundtrip
+    and per-call Python overhead across concurrent callers.
+    """
+
+    def __init__(self, max_batch_size: int = 8, max_queue_time: float = 0.02):
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._queue = asyncio.Queue()
+        self._worker = None
+
+    def start(self):
+        """Start the background batching task (requires a running loop)"""
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background batching task"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, text: str, voice: str, speed: float, model: str = "tts-1-hd"):
+        """Queue a request and wait for its audio"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, voice, speed, model, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.max_queue_time
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._process(batch)
+
+    async def _process(self, batch):
+        groups = {}
+        for text, voice, speed, model, future in batch:
+            groups.setdefault((voice, speed, model), []).append((text, future))
+
+        for (voice, speed, model), items in groups.items():
+            texts = [text for text, _ in items]
+            try:
+                # Run the blocking inference off the event loop
+                results = await asyncio.to_thread(
+                    tts_model.generate_batch, texts, voice=voice, speed=speed, model=model
+                )
+                for (_, future), audio in zip(items, results):
+                    if not future.done():
+                        future.set_result(audio)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+
 def init_model():
     """Initialize the KittenTTS model with GPU acceleration"""
-    global tts_model
+    global tts_model, _voices_json
     if tts_model is None:
+        # Invalidate the cached voices payload for the fresh model
+        _voices_json = None
         try:
             logger.info("Loading KittenTTS model with GPU acceleration...")
             
             # Try to use our GPU-accelerated version first
             try:
-                from gpu_kitten_tts import GPUKittenTTS
-                tts_model = GPUKittenTTS()
+                from gpu_kitten_tts import get_tts
+                tts_model = get_tts()
                 
                 # Log performance info
                 perf_info = tts_model.get_performance_info()
@@ -77,34 +384,51 @@ def init_model():
 async def lifespan(app: FastAPI):
     """Handle application lifespan events"""
     # Startup
+    global tts_batcher
     try:
         init_model()
+        if hasattr(tts_model, 'generate_batch'):
+            tts_batcher = TTSBatcher()
+            tts_batcher.start()
+            logger.info("Request batcher started")
+        # Log the effective audio config so a stale/overridden config.py is
+        # obvious in the startup output
+        logger.info(f"Effective config: sample_rate={Config.DEFAULT_SAMPLE_RATE}, "
+                    f"max_chars_per_chunk={Config.MAX_CHARS_PER_CHUNK}")
         logger.info("Application startup completed successfully")
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
         raise
     
     yield
-    
+
     # Shutdown
+    if tts_batcher is not None:
+        await tts_batcher.stop()
+        tts_batcher = None
+    TTS_EXECUTOR.shutdown(wait=False)
     logger.info("Application shutdown")
+    _log_listener.stop()
 
 app = FastAPI(
     title="KittenTTS API Server", 
     version="1.0.0", 
     description="OpenAI-compatible TTS API server using KittenTTS",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultJSONResponse
 )
 
-class TTSRequest(BaseModel):
-    model: str = "tts-1-hd"  # OpenAI compatible model name
-    input: str  # Text to synthesize
-    voice: str = "alloy"  # Voice selection
-    response_format: Optional[Literal["mp3", "opus", "aac", "flac", "wav", "pcm"]] = "mp3"
-    speed: Optional[float] = 1.0  # Speed of speech (0.25 to 4.0)
+# Compress the JSON endpoints (voices/health/models compress 5-10x);
+# Starlette's default exclude list already skips audio/* responses, so the
+# encoded speech bytes are never recompressed. Level 4 keeps CPU cost low.
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=4)
 
-    class Config:
-        schema_extra = {
+class TTSRequest(BaseModel):
+    # Pydantic v2 config: validators are compiled into pydantic-core (Rust)
+    # at class creation, and unknown fields are dropped instead of stored
+    model_config = ConfigDict(
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "model": "tts-1-hd",
                 "input": "Hello, this is a test of the KittenTTS server!",
@@ -112,53 +436,54 @@ class TTSRequest(BaseModel):
                 "response_format": "mp3",
                 "speed": 1.0
             }
-        }
+        },
+    )
+
+    model: str = "tts-1-hd"  # OpenAI compatible model name
+    input: str  # Text to synthesize
+    voice: str = "alloy"  # Voice selection
+    response_format: Optional[Literal["mp3", "opus", "aac", "flac", "wav", "pcm"]] = "mp3"
+    speed: Optional[float] = 1.0  # Speed of speech (0.25 to 4.0)
+    stream: Optional[bool] = False  # Stream audio sentence-by-sentence (pcm/mp3/opus only)
+
+# Largest request body worth reading: the text limit in UTF-8 (up to 4
+# bytes per char) plus slack for the JSON envelope around it
+_MAX_BODY_BYTES = Config.MAX_TOTAL_CHARS * 4 + 4096
+
+@app.middleware("http")
+async def limit_body_size(request: Request, call_next):
+    """Reject oversized requests from the Content-Length header alone"""
+    content_length = request.headers.get("content-length")
+    if content_length is not None and int(content_length) > _MAX_BODY_BYTES:
+        # O(header) rejection: no body read, no JSON decode, no pydantic
+        return Response(
+            content=_dumps({"detail": "Request entity too large"}),
+            status_code=413,
+            media_type="application/json"
+        )
+    return await call_next(request)
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log incoming requests"""
-    logger.info(f"{request.method} {request.url.path} - {request.client.host}")
+    # Skip the string assembly entirely when INFO logging is off
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("%s %s - %s", request.method, request.url.path, request.client.host)
     response = await call_next(request)
     return response
 
 @app.get("/")
 async def root():
     """Root endpoint with server information"""
-    return {
-        "message": "KittenTTS API Server",
-        "status": "running",
-        "version": "1.0.0",
-        "endpoints": {
-            "speech": "/v1/audio/speech",
-            "models": "/v1/models", 
-            "voices": "/v1/audio/voices",
-            "health": "/health"
-        }
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 @app.get("/v1/models")
 async def list_models():
     """List available TTS models (OpenAI compatible)"""
-    return {
-        "object": "list",
-        "data": [
-            {
-                "id": "tts-1",
-                "object": "model",
-                "created": 1677610602,
-                "owned_by": "kittentts"
-            },
-            {
-                "id": "tts-1-hd",
-                "object": "model", 
-                "created": 1677610602,
-                "owned_by": "kittentts"
-            }
-        ]
-    }
+    return Response(content=_MODELS_JSON, media_type="application/json")
 
 @app.post("/v1/audio/speech")
-async def create_speech(request: TTSRequest):
+async def create_speech(request: TTSRequest, http_request: Request):
     """
     Generate speech from text using KittenTTS with intelligent chunking
     Compatible with OpenAI TTS API format
@@ -176,132 +501,209 @@ async def create_speech(request: TTSRequest):
             else:
                 raise HTTPException(status_code=400, detail=error_msg)
         
-        # Initialize model if not already done
+        # The model is loaded (and warmed) in lifespan; a request arriving
+        # without it means startup failed, not that we should load it here
         if tts_model is None:
-            logger.info("Model not initialized, initializing now...")
-            init_model()
+            raise HTTPException(status_code=503, detail="TTS model not loaded")
         
         # Map voice and validate speed
-        kitten_voice = Config.VOICE_MAPPING.get(request.voice, "expr-voice-5-m")
+        kitten_voice = _VOICE_GET(request.voice, "expr-voice-5-m")
         speed = Config.clamp_speed(request.speed)
-        
+        format_ext = request.response_format or "wav"
+
+        # Normalize the model tier once: "tts-1" only changes the audio when
+        # the wrapper actually loaded the INT8 fast session, so when both
+        # names synthesize identically they keep sharing cache entries
+        if request.model == "tts-1" and getattr(tts_model, 'fast_session', None) is not None:
+            model_id = "tts-1"
+            model_kwargs = {"model": "tts-1"}
+        else:
+            model_id = "tts-1-hd"
+            model_kwargs = {}
+
+        # Serve repeated prompts straight from the response cache; the key
+        # digest doubles as the ETag so clients holding the bytes can
+        # revalidate without transferring the audio at all
+        cache_key = _cache_key(request.input, kitten_voice, speed, format_ext, model_id)
+        etag = cache_key.hex()
+        if http_request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            audio_bytes, actual_ext, cached_content_type = cached
+            logger.info(f"Response cache hit ({len(audio_bytes)} bytes, format {actual_ext})")
+            return Response(
+                content=audio_bytes,
+                media_type=cached_content_type,
+                headers={
+                    "Content-Disposition": CONTENT_DISPOSITION[actual_ext],
+                    "ETag": etag,
+                    "X-Cache": "hit",
+                    "X-Text-Length": str(len(request.input))
+                }
+            )
+
+        # Stream sentence-by-sentence for formats whose chunks concatenate
+        # cleanly: time-to-first-byte becomes O(first sentence) instead of
+        # O(whole utterance)
+        if request.stream and format_ext in _STREAMABLE_FORMATS:
+            sentences = split_sentences(request.input)
+            logger.info(f"Streaming {len(sentences)} sentences as {format_ext}")
+
+            # WAV streams as a single header plus raw PCM chunk bodies
+            chunk_format = "pcm" if format_ext == "wav" else format_ext
+
+            async def stream_audio():
+                loop = asyncio.get_running_loop()
+                # Phonemize the remaining sentences on a spare worker while
+                # the first sentence's inference runs, so each later
+                # generate() finds its tokens already cached (overlap needs
+                # TTS_WORKERS > 1; with one worker this just queues behind)
+                if len(sentences) > 1 and hasattr(tts_model, 'prefetch_tokenize'):
+                    loop.run_in_executor(
+                        TTS_EXECUTOR, tts_model.prefetch_tokenize, sentences[1:]
+                    )
+                if format_ext == "wav":
+                    yield _wav_stream_header(22050)
+                for sentence in sentences:
+                    audio = await loop.run_in_executor(
+                        TTS_EXECUTOR,
+                        partial(tts_model.generate, sentence, voice=kitten_voice,
+                                speed=speed, **model_kwargs)
+                    )
+                    chunk_bytes, _ = await loop.run_in_executor(
+                        TTS_EXECUTOR, encode_audio, np.asarray(audio), 22050, chunk_format
+                    )
+                    yield chunk_bytes
+
+            return StreamingResponse(
+                stream_audio(),
+                media_type=_STREAMABLE_FORMATS[format_ext],
+                headers={"X-Streaming": "true", "X-Text-Length": str(len(request.input))}
+            )
+
         # Determine if chunking is needed
         text_length = len(request.input)
         needs_chunking = Config.ENABLE_CHUNKING and text_length > Config.MAX_CHARS_PER_CHUNK
         
-        logger.info(
-            f"Processing text - Length: {text_length}, Voice: {kitten_voice}, "
-            f"Speed: {speed}, Format: {request.response_format}, Chunking: {needs_chunking}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Processing text - Length: {text_length}, Voice: {kitten_voice}, "
+                f"Speed: {speed}, Format: {request.response_format}, Chunking: {needs_chunking}"
+            )
         
         if needs_chunking:
-            # Use chunking for large texts
-            chunker = TextChunker(max_chunk_size=Config.MAX_CHARS_PER_CHUNK)
-            chunks = chunker.chunk_text(request.input)
-            
+            # Use chunking for large texts (shared chunker, memoized result)
+            chunks = chunk_text_cached(request.input, Config.MAX_CHARS_PER_CHUNK)
+
             logger.info(f"Split text into {len(chunks)} chunks for processing")
             
             # Generate audio for each chunk
-            audio_segments = []
-            sample_rate = None
-            
-            for i, chunk in enumerate(chunks):
-                logger.debug(f"Processing chunk {i+1}/{len(chunks)}: '{chunk[:50]}...'")
-                
+            if hasattr(tts_model, 'generate_batch'):
+                # Single phonemizer call for all chunks (one espeak roundtrip)
                 try:
-                    chunk_audio = tts_model.generate(chunk, voice=kitten_voice, speed=speed)
-                    
-                    # Store sample rate from first chunk
-                    if sample_rate is None:
-                        sample_rate = getattr(chunk_audio, 'sample_rate', 22050)
-                    
-                    # Convert to numpy array if needed
-                    if hasattr(chunk_audio, 'numpy'):
-                        chunk_audio = chunk_audio.numpy()
-                    elif not isinstance(chunk_audio, np.ndarray):
-                        chunk_audio = np.array(chunk_audio)
-                    
-                    audio_segments.append(chunk_audio)
-                    
-                except Exception as chunk_error:
-                    logger.error(f"Failed to process chunk {i+1}: {chunk_error}")
+                    raw_segments = await asyncio.get_running_loop().run_in_executor(
+                        TTS_EXECUTOR,
+                        partial(tts_model.generate_batch, chunks, voice=kitten_voice,
+                                speed=speed, **model_kwargs)
+                    )
+                except Exception as batch_error:
+                    logger.error(f"Failed to process chunk batch: {batch_error}")
                     raise HTTPException(
                         status_code=500,
-                        detail=f"Failed to process text chunk {i+1}/{len(chunks)}: {str(chunk_error)}"
+                        detail=f"Failed to process text chunks: {str(batch_error)}"
                     )
-            
-            # Concatenate all audio segments
-            if audio_segments:
-                # Add small silence between chunks (0.1 seconds)
-                silence_samples = int(sample_rate * 0.1)
-                silence = np.zeros(silence_samples, dtype=audio_segments[0].dtype)
-                
-                # Interleave audio segments with silence
-                final_audio_parts = []
-                for i, segment in enumerate(audio_segments):
-                    final_audio_parts.append(segment)
-                    if i < len(audio_segments) - 1:  # Don't add silence after last segment
-                        final_audio_parts.append(silence)
-                
-                audio_data = np.concatenate(final_audio_parts)
-                
-                # Set sample rate attribute for compatibility
-                audio_data = AudioData(
-                    array=audio_data,
-                    sample_rate=sample_rate,
-                    dtype=audio_data.dtype,
-                    shape=audio_data.shape
-                )
-                
-                logger.info(f"Successfully concatenated {len(chunks)} chunks into final audio")
             else:
+                # Fallback for models without batch support: synthesize
+                # chunks concurrently (ORT releases the GIL inside
+                # session.run), writing into an index-addressed list so
+                # the concatenation order stays deterministic
+                loop = asyncio.get_running_loop()
+                semaphore = asyncio.Semaphore(Config.TTS_WORKERS)
+                raw_segments = [None] * len(chunks)
+
+                async def synth_chunk(index, chunk):
+                    async with semaphore:
+                        raw_segments[index] = await loop.run_in_executor(
+                            TTS_EXECUTOR,
+                            partial(tts_model.generate, chunk, voice=kitten_voice,
+                                    speed=speed, **model_kwargs)
+                        )
+
+                try:
+                    await asyncio.gather(
+                        *(synth_chunk(i, chunk) for i, chunk in enumerate(chunks))
+                    )
+                except Exception as chunk_error:
+                    logger.error(f"Failed to process chunks: {chunk_error}")
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Failed to process text chunks: {str(chunk_error)}"
+                    )
+
+            if not raw_segments:
                 raise HTTPException(status_code=500, detail="No audio segments were generated")
+
+            # The conversion + merge walks multi-MB float arrays, so it
+            # runs on the executor like the inference and encode steps do
+            audio_array, sample_rate = await asyncio.get_running_loop().run_in_executor(
+                TTS_EXECUTOR, _assemble_segments, raw_segments
+            )
+
+            logger.info(f"Successfully concatenated {len(chunks)} chunks into final audio")
                 
         else:
             # Process as single chunk (original behavior)
             logger.info(f"Processing as single chunk: '{request.input[:50]}...'")
-            audio_data = tts_model.generate(request.input, voice=kitten_voice, speed=speed)
-        
-        # Determine content type and filename based on format
-        content_types = {
-            "wav": "audio/wav",
-            "mp3": "audio/mpeg",
-            "opus": "audio/opus",
-            "aac": "audio/aac", 
-            "flac": "audio/flac",
-            "pcm": "audio/pcm"
-        }
-        
-        format_ext = request.response_format or "wav"
-        content_type = content_types.get(format_ext, "audio/wav")
-        filename = f"speech.{format_ext}"
-        
-        # Convert audio data to bytes
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            try:
-                # Get sample rate
-                sample_rate = getattr(audio_data, 'sample_rate', 22050)
-                
-                # Convert to numpy array if needed
-                if hasattr(audio_data, '__array__'):
-                    audio_array = audio_data.__array__()
-                elif hasattr(audio_data, 'numpy'):
-                    audio_array = audio_data.numpy()
-                else:
-                    audio_array = np.array(audio_data)
-                
-                # Write audio file
-                sf.write(tmp_file.name, audio_array, sample_rate)
-                
-                # Read the audio file data
-                with open(tmp_file.name, "rb") as f:
-                    audio_bytes = f.read()
-                    
-            finally:
-                # Clean up temporary file
-                if os.path.exists(tmp_file.name):
-                    os.unlink(tmp_file.name)
-        
+
+            # Fast path: encode PCM16 WAV inside the model wrapper, skipping
+            # the float-array -> temp-file -> bytes round trip below
+            if (tts_batcher is None and request.response_format == "wav"
+                    and hasattr(tts_model, 'generate_wav_bytes')):
+                audio_bytes = await asyncio.get_running_loop().run_in_executor(
+                    TTS_EXECUTOR,
+                    partial(tts_model.generate_wav_bytes, request.input,
+                            voice=kitten_voice, speed=speed, sample_rate=22050,
+                            **model_kwargs)
+                )
+                logger.info(f"Successfully generated {len(audio_bytes)} bytes of audio (wav fast path)")
+                _cache_put(cache_key, (audio_bytes, "wav", "audio/wav"))
+                return Response(
+                    content=audio_bytes,
+                    media_type="audio/wav",
+                    headers={
+                        "Content-Disposition": CONTENT_DISPOSITION["wav"],
+                        "ETag": etag,
+                        "X-Chunks-Processed": "1",
+                        "X-Text-Length": str(text_length)
+                    }
+                )
+
+            if tts_batcher is not None:
+                # Ride the shared batcher so concurrent callers share a batch
+                audio = await tts_batcher.submit(request.input, kitten_voice, speed, model_id)
+            else:
+                audio = await asyncio.get_running_loop().run_in_executor(
+                    TTS_EXECUTOR,
+                    partial(tts_model.generate, request.input, voice=kitten_voice,
+                            speed=speed, **model_kwargs)
+                )
+
+            # One sample-rate read, one array conversion — no wrapper object
+            sample_rate = getattr(audio, 'sample_rate', 22050)
+            audio_array = _as_np(audio)
+
+        # Encode natively into the requested container; falls back to WAV
+        # when an optional encoder dependency is missing
+        audio_bytes, actual_ext = await asyncio.get_running_loop().run_in_executor(
+            TTS_EXECUTOR, encode_audio, audio_array, sample_rate, format_ext
+        )
+        content_type = CONTENT_TYPES.get(actual_ext, "audio/wav")
+
+
+        _cache_put(cache_key, (audio_bytes, actual_ext, content_type))
+
         # Log success with chunking info
         chunk_info = f" ({len(chunks)} chunks)" if needs_chunking else ""
         logger.info(f"Successfully generated {len(audio_bytes)} bytes of audio{chunk_info}")
@@ -310,8 +712,10 @@ async def create_speech(request: TTSRequest):
             content=audio_bytes,
             media_type=content_type,
             headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(audio_bytes)),
+                "Content-Disposition": CONTENT_DISPOSITION.get(
+                    actual_ext, "attachment; filename=speech.wav"
+                ),
+                "ETag": etag,
                 "X-Chunks-Processed": str(len(chunks) if needs_chunking and 'chunks' in locals() else 1),
                 "X-Text-Length": str(text_length)
             }
@@ -336,74 +740,92 @@ async def create_speech(request: TTSRequest):
 @app.get("/v1/audio/voices")
 async def list_voices():
     """List available voices (extension to OpenAI API)"""
+    global _voices_json
     try:
-        if tts_model is None:
-            init_model()
-        
+        if _voices_json is not None:
+            return Response(content=_voices_json, media_type="application/json")
+
         # Get available voices from KittenTTS
         try:
             kitten_voices = tts_model.available_voices
         except AttributeError:
             # Fallback if available_voices is not implemented
             kitten_voices = list(Config.VOICE_MAPPING.values())
-        
+
         openai_voices = list(Config.VOICE_MAPPING.keys())
-        
-        return {
+
+        _voices_json = _dumps({
             "object": "list",
             "data": {
                 "openai_compatible": openai_voices,
-                "kitten_native": kitten_voices,
+                "kitten_native": list(kitten_voices),
                 "voice_mapping": Config.VOICE_MAPPING,
                 "total_voices": len(openai_voices)
             }
-        }
+        })
+        return Response(content=_voices_json, media_type="application/json")
     except Exception as e:
         logger.error(f"Error listing voices: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to list voices: {str(e)}")
 
+# Health snapshot: the payload only changes when the model object changes,
+# but load balancers and k8s probes hit /health constantly — so the dict
+# build + JSON encode happen once per model state, not once per probe
+_health_json = None
+_health_model = object()  # Sentinel that never matches, forcing the first build
+
+def _rebuild_health():
+    """Rebuild the pre-serialized /health payload for the current model"""
+    global _health_json, _health_model
+    model_status = tts_model is not None
+
+    # Try to get model info if available
+    model_info = {}
+    if model_status:
+        try:
+            model_info = {
+                "voices_available": len(getattr(tts_model, 'available_voices', [])),
+                "model_type": str(type(tts_model).__name__)
+            }
+
+            # Add GPU performance info if available
+            if hasattr(tts_model, 'get_performance_info'):
+                perf_info = tts_model.get_performance_info()
+                model_info.update({
+                    "gpu_acceleration": perf_info.get('gpu_enabled', False),
+                    "execution_providers": perf_info.get('providers', []),
+                    "gpu_provider": perf_info.get('gpu_provider', 'none')
+                })
+
+        except Exception as e:
+            logger.warning(f"Could not get model info: {e}")
+
+    _health_json = _dumps({
+        "status": "healthy" if model_status else "model_not_loaded",
+        "model_loaded": model_status,
+        "server_version": "1.0.0",
+        "model_info": model_info,
+        "supported_formats": ["wav", "mp3"],
+        "config": {
+            "max_text_length": Config.MAX_TEXT_LENGTH,
+            "max_total_chars": Config.MAX_TOTAL_CHARS,
+            "max_chars_per_chunk": Config.MAX_CHARS_PER_CHUNK,
+            "chunking_enabled": Config.ENABLE_CHUNKING,
+            "available_voices": len(Config.VOICE_MAPPING),
+            "gpu_acceleration_enabled": Config.USE_GPU
+        }
+    })
+    _health_model = tts_model
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     try:
-        model_status = tts_model is not None
-        
-        # Try to get model info if available
-        model_info = {}
-        if model_status:
-            try:
-                model_info = {
-                    "voices_available": len(getattr(tts_model, 'available_voices', [])),
-                    "model_type": str(type(tts_model).__name__)
-                }
-                
-                # Add GPU performance info if available
-                if hasattr(tts_model, 'get_performance_info'):
-                    perf_info = tts_model.get_performance_info()
-                    model_info.update({
-                        "gpu_acceleration": perf_info.get('gpu_enabled', False),
-                        "execution_providers": perf_info.get('providers', []),
-                        "gpu_provider": perf_info.get('gpu_provider', 'none')
-                    })
-                
-            except Exception as e:
-                logger.warning(f"Could not get model info: {e}")
-        
-        return {
-            "status": "healthy" if model_status else "model_not_loaded",
-            "model_loaded": model_status,
-            "server_version": "1.0.0",
-            "model_info": model_info,
-            "supported_formats": ["wav", "mp3"],
-            "config": {
-                "max_text_length": Config.MAX_TEXT_LENGTH,
-                "max_total_chars": Config.MAX_TOTAL_CHARS,
-                "max_chars_per_chunk": Config.MAX_CHARS_PER_CHUNK,
-                "chunking_enabled": Config.ENABLE_CHUNKING,
-                "available_voices": len(Config.VOICE_MAPPING),
-                "gpu_acceleration_enabled": Config.USE_GPU
-            }
-        }
+        # One identity check per probe; the snapshot is rebuilt only on
+        # model state transitions (startup, reload, test patching)
+        if tts_model is not _health_model:
+            _rebuild_health()
+        return Response(content=_health_json, media_type="application/json")
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return {
@@ -415,43 +837,28 @@ async def health_check():
 @app.get("/gpu/status")
 async def gpu_status():
     """Get detailed GPU acceleration status"""
+    global _gpu_status_cache
     try:
         if tts_model is None:
-            init_model()
-        
-        # Get performance info if available
-        if hasattr(tts_model, 'get_performance_info'):
-            perf_info = tts_model.get_performance_info()
-            return {
-                "gpu_acceleration": {
-                    "enabled": perf_info.get('gpu_enabled', False),
-                    "provider": perf_info.get('gpu_provider', 'auto'),
-                    "active_providers": perf_info.get('providers', []),
-                    "onnx_threads": perf_info.get('onnx_threads', 'auto')
-                },
-                "model_info": {
-                    "type": str(type(tts_model).__name__),
-                    "model_path": perf_info.get('model_path', 'unknown'),
-                    "voices_count": perf_info.get('voices_count', 0)
-                },
-                "system_info": {
-                    "available_providers": [],  # Will be populated below
-                }
-            }
-        else:
             return {
-                "gpu_acceleration": {
-                    "enabled": False,
-                    "provider": "standard_kittentts",
-                    "active_providers": ["CPUExecutionProvider"],
-                    "note": "Using standard KittenTTS without GPU acceleration"
-                },
-                "model_info": {
-                    "type": str(type(tts_model).__name__),
-                    "voices_count": len(getattr(tts_model, 'available_voices', []))
-                }
+                "gpu_acceleration": {"enabled": False},
+                "status": "model_not_loaded"
             }
-            
+
+        # Short-TTL cache: the payload is mostly invariant post-init (only
+        # the cache counters drift), so monitoring probes shouldn't hit the
+        # model's introspection on every poll
+        now = time.monotonic()
+        if (_gpu_status_cache is not None
+                and now < _gpu_status_cache[0]
+                and tts_model is _gpu_status_cache[2]):
+            return Response(content=_gpu_status_cache[1], media_type="application/json")
+
+        payload = _build_gpu_status()
+        body = _dumps(payload)
+        _gpu_status_cache = (now + _GPU_STATUS_TTL, body, tts_model)
+        return Response(content=body, media_type="application/json")
+
     except Exception as e:
         logger.error(f"GPU status check failed: {e}")
         return {
@@ -459,6 +866,41 @@ async def gpu_status():
             "gpu_acceleration": {"enabled": False}
         }
 
+def _build_gpu_status() -> dict:
+    """Assemble the /gpu/status payload from model introspection"""
+    # Get performance info if available
+    if hasattr(tts_model, 'get_performance_info'):
+        perf_info = tts_model.get_performance_info()
+        return {
+            "gpu_acceleration": {
+                "enabled": perf_info.get('gpu_enabled', False),
+                "provider": perf_info.get('gpu_provider', 'auto'),
+                "active_providers": perf_info.get('providers', []),
+                "onnx_threads": perf_info.get('onnx_threads', 'auto')
+            },
+            "model_info": {
+                "type": str(type(tts_model).__name__),
+                "model_path": perf_info.get('model_path', 'unknown'),
+                "voices_count": perf_info.get('voices_count', 0)
+            },
+            "system_info": {
+                "available_providers": [],  # Will be populated below
+            }
+        }
+    else:
+        return {
+            "gpu_acceleration": {
+                "enabled": False,
+                "provider": "standard_kittentts",
+                "active_providers": ["CPUExecutionProvider"],
+                "note": "Using standard KittenTTS without GPU acceleration"
+            },
+            "model_info": {
+                "type": str(type(tts_model).__name__),
+                "voices_count": len(getattr(tts_model, 'available_voices', []))
+            }
+        }
+
 if __name__ == "__main__":
     print("🐱 Starting KittenTTS API Server...")
     print("=" * 50)
@@ -471,10 +913,15 @@ if __name__ == "__main__":
     print("")
     
     try:
+        # Import string (not the app object) so workers>1 can spawn;
+        # uvloop/httptools come with uvicorn[standard]
         uvicorn.run(
-            app, 
-            host=Config.HOST, 
+            "server:app",
+            host=Config.HOST,
             port=Config.PORT,
+            workers=Config.WORKERS,
+            loop="uvloop",
+            http="httptools",
             log_level=Config.LOG_LEVEL.lower()
         )
     except KeyboardInterrupt:
@@ -0,0 +1,25 @@
+"""
+Shared fixtures for the KittenTTS server test suite
+"""
+
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import app
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    """In-process client with the app lifespan run once per session.
+
+    Entering the TestClient context runs startup (model load and warmup),
+    so every test that needs a live model shares one initialization
+    instead of spawning a subprocess and polling for it to come up.
+    """
+    with TestClient(app) as client:
+        yield client
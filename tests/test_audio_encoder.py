@@ -0,0 +1,83 @@
+"""
+Tests for the audio encoding utilities
+"""
+
+import numpy as np
+import pytest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_encoder import encode_audio, _to_pcm16
+
+
+@pytest.fixture
+def audio():
+    """One second of a 440 Hz sine at 22050 Hz"""
+    t = np.linspace(0, 1, 22050, dtype=np.float32)
+    return 0.5 * np.sin(2 * np.pi * 440 * t)
+
+
+class TestEncodeAudio:
+    """Test the encoder table"""
+
+    def test_wav_encoding(self, audio):
+        """WAV output starts with a RIFF header"""
+        data, actual = encode_audio(audio, 22050, "wav")
+        assert actual == "wav"
+        assert data[:4] == b"RIFF"
+
+    def test_wav_header_fields(self, audio):
+        """The packed WAV header carries the right rate and sizes"""
+        import struct
+
+        data, _ = encode_audio(audio, 22050, "wav")
+        assert len(data) == 44 + len(audio) * 2
+        (riff, riff_size, wave, fmt, fmt_size, fmt_tag, channels,
+         rate, byte_rate, block_align, bits, marker, data_size) = struct.unpack(
+            '<4sI4s4sIHHIIHH4sI', data[:44]
+        )
+        assert wave == b"WAVE"
+        assert (fmt_tag, channels, bits) == (1, 1, 16)
+        assert rate == 22050
+        assert byte_rate == 22050 * 2
+        assert data_size == len(audio) * 2
+        assert riff_size == 36 + data_size
+
+    def test_pcm_encoding(self, audio):
+        """PCM output is raw int16 samples with no container"""
+        data, actual = encode_audio(audio, 22050, "pcm")
+        assert actual == "pcm"
+        assert len(data) == len(audio) * 2  # 2 bytes per sample
+
+    def test_flac_encoding(self, audio):
+        """FLAC output starts with the fLaC marker"""
+        data, actual = encode_audio(audio, 22050, "flac")
+        assert actual == "flac"
+        assert data[:4] == b"fLaC"
+
+    def test_unknown_format_falls_back_to_wav(self, audio):
+        """Unknown formats encode as WAV"""
+        data, actual = encode_audio(audio, 22050, "bogus")
+        assert data[:4] == b"RIFF"
+
+    def test_mp3_encoding_or_wav_fallback(self, audio):
+        """MP3 encodes when lameenc is installed, else falls back to WAV"""
+        data, actual = encode_audio(audio, 22050, "mp3")
+        if actual == "mp3":
+            assert data[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2", b"ID")
+        else:
+            assert actual == "wav"
+            assert data[:4] == b"RIFF"
+
+
+class TestPcm16Conversion:
+    """Test float -> PCM16 conversion"""
+
+    def test_clipping(self):
+        """Out-of-range samples are clipped, not wrapped"""
+        pcm = _to_pcm16(np.array([2.0, -2.0, 0.0], dtype=np.float32))
+        assert pcm[0] == 32767
+        assert pcm[1] == -32767
+        assert pcm[2] == 0
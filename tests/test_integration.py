@@ -11,9 +11,39 @@ import os
 import signal
 from pathlib import Path
 
+
+def wait_for_ready(base_url, timeout=15, process=None):
+    """Poll the health endpoint with exponential backoff until it answers.
+
+    Returns as soon as the server responds with 200; raises TimeoutError
+    after the deadline, or immediately if the watched process has already
+    exited. Replaces a fixed sleep that both overshot fast startups and
+    undershot slow ones.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    while True:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        if process is not None and process.poll() is not None:
+            raise TimeoutError(f"Server at {base_url} exited with code {process.returncode}")
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Server at {base_url} not ready after {timeout}s")
+        time.sleep(min(delay, deadline - time.monotonic()))
+        delay = min(delay * 2, 1.6)
+
 @pytest.mark.integration
+@pytest.mark.subprocess
 class TestKittenTTSIntegration:
-    """Integration tests that require actual KittenTTS installation"""
+    """Integration tests that require actual KittenTTS installation
+
+    These are the only tests that exercise a real network socket; everything
+    else drives the app in-process through the session-scoped api_client
+    fixture, which runs the lifespan (and the model load) exactly once.
+    """
     
     @pytest.fixture(scope="class")
     def server_process(self):
@@ -39,28 +69,26 @@ class TestKittenTTSIntegration:
                 stderr=subprocess.PIPE
             )
             
-            # Wait for server to start
-            time.sleep(5)
-            
-            # Check if server is responding
+            # Wait for server to start (backoff poll, not a fixed sleep)
             try:
-                response = requests.get("http://localhost:8002/health", timeout=5)
-                if response.status_code != 200:
-                    process.terminate()
-                    pytest.skip("Server failed to start properly")
-            except requests.RequestException:
+                wait_for_ready("http://localhost:8002", process=process)
+            except TimeoutError:
                 process.terminate()
                 pytest.skip("Server not responding")
-            
+
             yield process
-            
+
         except Exception as e:
             pytest.skip(f"Could not start server: {e}")
         finally:
-            # Clean up
+            # Clean up; escalate to kill so a hung server can't stall teardown
             if 'process' in locals():
                 process.terminate()
-                process.wait(timeout=10)
+                try:
+                    process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait(timeout=5)
 
     def test_health_endpoint(self, server_process):
         """Test the health endpoint with actual server"""
@@ -151,31 +179,49 @@ class TestPerformance:
         not os.getenv("KITTENTTS_PERFORMANCE_TESTS"),
         reason="Set KITTENTTS_PERFORMANCE_TESTS=1 to run performance tests"
     )
-    def test_concurrent_requests(self, server_process):
+    @pytest.mark.asyncio
+    async def test_concurrent_requests(self, api_client):
         """Test server can handle multiple concurrent requests"""
-        import concurrent.futures
-        import threading
-        
-        def make_request(text):
+        import asyncio
+        import httpx
+
+        from server import app
+
+        # One event loop and one pooled connection set instead of a thread
+        # per request: this measures server concurrency, not client thread
+        # contention, and fan-out can be raised without adding threads.
+        # The api_client fixture has already run the lifespan, so the ASGI
+        # transport hits a loaded model without sockets or a subprocess.
+        n_requests = int(os.getenv("KITTENTTS_CONCURRENT_REQUESTS", "5"))
+        # Requests per second at which the load arrives; 0 = one burst.
+        # A controlled arrival rate separates queueing latency from compute
+        # latency, which a burst of simultaneous posts cannot distinguish
+        request_rate = float(os.getenv("KITTENTTS_REQUEST_RATE", "0"))
+
+        async def make_request(client, text):
+            if request_rate > 0:
+                await asyncio.sleep(int(text) / request_rate)
             try:
-                response = requests.post(
-                    "http://localhost:8002/v1/audio/speech",
+                response = await client.post(
+                    "/v1/audio/speech",
                     json={
                         "model": "tts-1-hd",
                         "input": f"Test message {text}",
                         "voice": "alloy"
                     },
-                    timeout=60
                 )
                 return response.status_code, len(response.content)
             except Exception as e:
                 return None, str(e)
-        
-        # Make 5 concurrent requests
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(make_request, i) for i in range(5)]
-            results = [future.result() for future in futures]
-        
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://testserver", timeout=60
+        ) as client:
+            results = await asyncio.gather(
+                *[make_request(client, i) for i in range(n_requests)]
+            )
+
         # Check results
         successful_requests = [r for r in results if r[0] == 200]
-        assert len(successful_requests) >= 3  # At least 60% success rate
+        assert len(successful_requests) >= n_requests * 3 // 5  # At least 60% success rate
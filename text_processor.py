@@ -4,11 +4,19 @@ Handles text chunking for large inputs to improve TTS processing.
 """
 
 import re
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import: none of these depend on chunker configuration
+_SENTENCE_ENDINGS = re.compile(r'[.!?]+\s+')
+_SENTENCE_RE = re.compile(r'(.*?)([.!?]+)\s+', re.DOTALL)
+_PARAGRAPH_BREAKS = re.compile(r'\n\s*\n')
+_DIALOGUE_PATTERN = re.compile(r'"[^"]*"')
+_LIST_ITEM_PATTERN = re.compile(r'^\s*[-*•]\s+', re.MULTILINE)
+
 class TextChunker:
     """
     Intelligent text chunker that splits large text into manageable chunks
@@ -23,15 +31,15 @@ class TextChunker:
             max_chunk_size: Maximum characters per chunk
         """
         self.max_chunk_size = max_chunk_size
-        
-        # Sentence boundary patterns (improved for various cases)
-        self.sentence_endings = re.compile(r'[.!?]+\s+')
-        self.paragraph_breaks = re.compile(r'\n\s*\n')
-        
-        # Patterns for preserving context
-        self.dialogue_pattern = re.compile(r'"[^"]*"')
-        self.list_item_pattern = re.compile(r'^\s*[-*•]\s+', re.MULTILINE)
-        
+
+        # Shared module-level patterns (sentence boundary in both split and
+        # single-pass form, plus the context-preserving helpers)
+        self.sentence_endings = _SENTENCE_ENDINGS
+        self._sentence_re = _SENTENCE_RE
+        self.paragraph_breaks = _PARAGRAPH_BREAKS
+        self.dialogue_pattern = _DIALOGUE_PATTERN
+        self.list_item_pattern = _LIST_ITEM_PATTERN
+
     def chunk_text(self, text: str) -> List[str]:
         """
         Split text into chunks while preserving natural boundaries.
@@ -54,43 +62,50 @@ class TextChunker:
         logger.info(f"Chunking text of {len(text)} characters into chunks of max {self.max_chunk_size}")
         
         chunks = []
-        
-        # First, try to split by paragraphs
-        paragraphs = self.paragraph_breaks.split(text)
-        
-        current_chunk = ""
-        
+
+        # First, try to split by paragraphs. Most API text has no newlines
+        # at all, so a C-level substring check skips the regex scan in the
+        # common case.
+        if '\n' not in text:
+            paragraphs = [text]
+        else:
+            paragraphs = self.paragraph_breaks.split(text)
+
+        # Accumulate pieces in a list with a running length: appending to a
+        # str re-copies the whole chunk each time (quadratic on long
+        # inputs), while a list append is O(1) with one join per flush
+        current_buf = []
+        current_len = 0
+
+        def flush():
+            nonlocal current_buf, current_len
+            chunks.append("\n\n".join(current_buf))
+            current_buf = []
+            current_len = 0
+
         for paragraph in paragraphs:
             paragraph = paragraph.strip()
             if not paragraph:
                 continue
-                
+
             # If the paragraph itself is too long, split it first
             if len(paragraph) > self.max_chunk_size:
                 para_chunks = self._split_paragraph(paragraph)
                 for p in para_chunks:
-                    if current_chunk and len(current_chunk) + len(p) + 2 > self.max_chunk_size:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = p
-                    else:
-                        if current_chunk:
-                            current_chunk += "\n\n" + p
-                        else:
-                            current_chunk = p
+                    if current_buf and current_len + len(p) + 2 > self.max_chunk_size:
+                        flush()
+                    current_len += len(p) + 2 if current_buf else len(p)
+                    current_buf.append(p)
                 continue
 
             # Try to append paragraph to current chunk
-            if current_chunk and len(current_chunk) + len(paragraph) + 2 > self.max_chunk_size:
-                chunks.append(current_chunk.strip())
-                current_chunk = paragraph
-            else:
-                if current_chunk:
-                    current_chunk += "\n\n" + paragraph
-                else:
-                    current_chunk = paragraph
+            if current_buf and current_len + len(paragraph) + 2 > self.max_chunk_size:
+                flush()
+            current_len += len(paragraph) + 2 if current_buf else len(paragraph)
+            current_buf.append(paragraph)
         # Add final chunk if any
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_buf:
+            flush()
             
         # Validate chunks
         chunks = [chunk for chunk in chunks if chunk.strip()]
@@ -98,6 +113,44 @@ class TextChunker:
         logger.info(f"Split into {len(chunks)} chunks")
         return chunks
     
+    def chunk_text_bucketed(self, text: str, n_buckets: int = 4) -> Tuple[List[List[str]], List[int]]:
+        """Chunk text and group the chunks into length buckets.
+
+        Batched synthesis pads every sequence in a batch to the longest
+        one, so batching similar-length chunks together cuts the padding
+        waste roughly by the bucket count. (The current model export takes
+        no attention mask and cannot consume padded batches; this grouping
+        is for callers that batch against a masked export.)
+
+        Args:
+            text: Input text to chunk
+            n_buckets: Number of equal-width length buckets
+
+        Returns:
+            Tuple of (buckets, order): buckets holds n_buckets lists of
+            chunks from shortest to longest (some possibly empty); order
+            lists the original chunk index of each chunk as the buckets are
+            traversed in sequence, so per-chunk audio can be put back in
+            reading order after batched synthesis
+        """
+        chunks = self.chunk_text(text)
+        if not chunks:
+            return [[] for _ in range(n_buckets)], []
+
+        lengths = [len(chunk) for chunk in chunks]
+        lo = min(lengths)
+        width = (max(lengths) + 1 - lo) / n_buckets
+        bucket_ids = [min(int((length - lo) / width), n_buckets - 1) for length in lengths]
+
+        buckets = [[] for _ in range(n_buckets)]
+        order = []
+        for bucket_id in range(n_buckets):
+            for i, chunk in enumerate(chunks):
+                if bucket_ids[i] == bucket_id:
+                    buckets[bucket_id].append(chunk)
+                    order.append(i)
+        return buckets, order
+
     def _split_paragraph(self, paragraph: str) -> List[str]:
         """
         Split a long paragraph into smaller chunks by sentences.
@@ -108,40 +161,38 @@ class TextChunker:
         Returns:
             List of paragraph chunks
         """
-        # Split by sentences
-        sentences = self.sentence_endings.split(paragraph)
-        
-        # Reconstruct sentences with their endings
+        # One regex pass: each match carries the sentence body and its
+        # punctuation, replacing the split + findall + zip reconstruction
         reconstructed_sentences = []
-        sentence_parts = self.sentence_endings.findall(paragraph)
-        
-        for i, sentence in enumerate(sentences[:-1]):  # All but last
-            if sentence.strip():
-                ending = sentence_parts[i] if i < len(sentence_parts) else ". "
-                reconstructed_sentences.append(sentence.strip() + ending.rstrip())
-        
+        tail_start = 0
+        for match in self._sentence_re.finditer(paragraph):
+            sentence = match.group(1).strip()
+            if sentence:
+                reconstructed_sentences.append(sentence + match.group(2))
+            tail_start = match.end()
+
         # Add the last sentence (no ending to add)
-        if sentences[-1].strip():
-            reconstructed_sentences.append(sentences[-1].strip())
+        tail = paragraph[tail_start:].strip()
+        if tail:
+            reconstructed_sentences.append(tail)
         
-        # Group sentences into chunks
+        # Group sentences into chunks (list buffer, one join per flush)
         chunks = []
-        current_chunk = ""
-        
+        current_buf = []
+        current_len = 0
+
         for sentence in reconstructed_sentences:
             # If adding this sentence would exceed chunk size
-            if current_chunk and len(current_chunk) + len(sentence) + 1 > self.max_chunk_size:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
-            else:
-                if current_chunk:
-                    current_chunk += " " + sentence
-                else:
-                    current_chunk = sentence
-        
+            if current_buf and current_len + len(sentence) + 1 > self.max_chunk_size:
+                chunks.append(" ".join(current_buf))
+                current_buf = []
+                current_len = 0
+            current_len += len(sentence) + 1 if current_buf else len(sentence)
+            current_buf.append(sentence)
+
         # Add final chunk
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_buf:
+            chunks.append(" ".join(current_buf))
         
         # If we still have chunks that are too long, split them more aggressively
         final_chunks = []
@@ -166,31 +217,31 @@ class TextChunker:
         """
         words = text.split()
         chunks = []
-        current_chunk = ""
-        
+        current_buf = []
+        current_len = 0
+
         for word in words:
             # Hard-split tokens longer than the max size
             if len(word) > self.max_chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
+                if current_buf:
+                    chunks.append(" ".join(current_buf))
+                    current_buf = []
+                    current_len = 0
                 for i in range(0, len(word), self.max_chunk_size):
                     chunks.append(word[i : i + self.max_chunk_size])
                 continue
 
             # If adding this word would exceed chunk size
-            if current_chunk and len(current_chunk) + len(word) + 1 > self.max_chunk_size:
-                chunks.append(current_chunk.strip())
-                current_chunk = word
-            else:
-                if current_chunk:
-                    current_chunk += " " + word
-                else:
-                    current_chunk = word
+            if current_buf and current_len + len(word) + 1 > self.max_chunk_size:
+                chunks.append(" ".join(current_buf))
+                current_buf = []
+                current_len = 0
+            current_len += len(word) + 1 if current_buf else len(word)
+            current_buf.append(word)
         # Add final chunk
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
+        if current_buf:
+            chunks.append(" ".join(current_buf))
+
         return chunks
     
     def estimate_processing_time(self, text: str) -> float:
@@ -205,13 +256,50 @@ class TextChunker:
         """
         # Rough estimate: ~100 characters per second for TTS
         base_time = len(text) / 100
-        
-        # Add overhead for chunking
-        chunks = self.chunk_text(text)
-        chunk_overhead = len(chunks) * 0.5  # 0.5 seconds per chunk overhead
-        
+
+        # Chunk-count overhead from arithmetic alone: actually chunking the
+        # text here would double the work for callers that chunk it anyway,
+        # and a ceiling division is as accurate as this estimate needs
+        n_chunks = -(-len(text) // self.max_chunk_size) if text else 0
+        chunk_overhead = n_chunks * 0.5  # 0.5 seconds per chunk overhead
+
         return base_time + chunk_overhead
 
+    @staticmethod
+    def estimate_processing_time_from_chunks(chunks: List[str]) -> float:
+        """
+        Estimate processing time from an already-computed chunk list.
+
+        Args:
+            chunks: Chunks previously returned by chunk_text
+
+        Returns:
+            Estimated processing time in seconds
+        """
+        return sum(len(chunk) for chunk in chunks) / 100 + len(chunks) * 0.5
+
+
+@lru_cache(maxsize=32)
+def get_chunker(max_chunk_size: int = 1200) -> TextChunker:
+    """Return the shared TextChunker for a chunk size.
+
+    Chunkers are stateless after construction, so per-request callers can
+    reuse one instance instead of rebuilding it every time.
+    """
+    return TextChunker(max_chunk_size=max_chunk_size)
+
+
+@lru_cache(maxsize=256)
+def chunk_text_cached(text: str, max_chunk_size: int = 1200) -> Tuple[str, ...]:
+    """Chunk text through a bounded memo of previous results.
+
+    Chunking is a pure function of (text, max_chunk_size), so repeated
+    prompts — retries, canned bot replies, the same text requested in
+    several formats — skip the scan entirely. Returns a tuple so cached
+    values stay immutable.
+    """
+    return tuple(get_chunker(max_chunk_size).chunk_text(text))
+
 
 def validate_text_input(text: str, max_total_chars: int) -> tuple[bool, Optional[str]]:
     """
@@ -224,14 +312,16 @@ def validate_text_input(text: str, max_total_chars: int) -> tuple[bool, Optional
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if not text or not text.strip():
+    # str.isspace scans without allocating, unlike strip() which copies the
+    # whole (up to max_total_chars) input just to test emptiness
+    if not text or text.isspace():
         return False, "Input text cannot be empty"
-    
+
     if len(text) > max_total_chars:
         return False, f"Input text too long. Maximum length is {max_total_chars} characters, got {len(text)}"
-    
-    # Check for potentially problematic content
+
+    # Check for potentially problematic content (the one remaining strip)
     if len(text.strip()) < 3:
         return False, "Input text too short. Minimum length is 3 characters"
-    
+
     return True, None